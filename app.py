@@ -2,6 +2,7 @@ import os
 import time
 
 from flask import Flask, render_template, request
+from jinja2 import FileSystemBytecodeCache
 
 from api.blueprint import create_api_blueprint
 from config import configure_logging
@@ -24,6 +25,15 @@ def create_app() -> Flask:
     # Load config from file.
     app.config.from_pyfile("settings.py")
 
+    # Optional on-disk Jinja bytecode cache so compiled templates are reused across
+    # app instances and processes (e.g. pytest-xdist workers). Unset = Jinja default.
+    bytecode_cache_dir = (os.getenv("JINJA_BYTECODE_CACHE_DIR") or "").strip()
+    if bytecode_cache_dir:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+            directory=bytecode_cache_dir, pattern="%s.cache"
+        )
+
     # Configure unified app logging (UTC timestamps, per-file logs, daily rotation)
     configure_app_logging(app.config.get("LOG_LEVEL", "INFO"))
     logger = get_logger(__name__)
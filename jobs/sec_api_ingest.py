@@ -39,6 +39,11 @@ _DIAG_ENV_VARS: tuple[str, ...] = (
     "SEC_API_KEY",
 )
 
+# fetch_status is NOT NULL (default 'pending'), so plain equality is the whole
+# "pending" test; it is also the predicate the partial ix_sec_filings_pending
+# index is defined on, which an `IS NULL OR ...` variant would not match.
+_PENDING = SecFiling.fetch_status == "pending"
+
 RAW_DATA_DIR = Path(__file__).resolve().parents[1] / "raw_data"
 FORMS_DIR = RAW_DATA_DIR / "forms"
 
@@ -210,11 +215,7 @@ def _available_pending_form_types(
 
     q = (
         session.query(SecFiling.form_type)
-        .filter(
-            or_(
-                SecFiling.fetch_status == None, SecFiling.fetch_status == "pending"
-            )  # noqa: E711
-        )
+        .filter(_PENDING)
         .filter(SecFiling.form_type != None)  # noqa: E711
     )
 
@@ -439,15 +440,7 @@ def _db_ingest_diagnostics(*, session: SASession) -> None:
     try:
         total = session.query(func.count(SecFiling.id)).scalar() or 0
         pending = (
-            session.query(func.count(SecFiling.id))
-            .filter(
-                or_(
-                    SecFiling.fetch_status == None,  # noqa: E711
-                    SecFiling.fetch_status == "pending",
-                )
-            )
-            .scalar()
-            or 0
+            session.query(func.count(SecFiling.id)).filter(_PENDING).scalar() or 0
         )
         logger.info(
             "DB diagnostics | sec_filings_total=%s pending_total=%s",
@@ -468,12 +461,7 @@ def _db_ingest_diagnostics(*, session: SASession) -> None:
 
         missing_doc = (
             session.query(func.count(SecFiling.id))
-            .filter(
-                or_(
-                    SecFiling.fetch_status == None,  # noqa: E711
-                    SecFiling.fetch_status == "pending",
-                )
-            )
+            .filter(_PENDING)
             .filter(
                 or_(SecFiling.document_url == None, SecFiling.document_url == "")
             )  # noqa: E711
@@ -549,11 +537,7 @@ def run_ingest(
     Returns summary counts.
     """
 
-    q = session.query(SecFiling).filter(
-        or_(
-            SecFiling.fetch_status == None, SecFiling.fetch_status == "pending"
-        )  # noqa: E711
-    )
+    q = session.query(SecFiling).filter(_PENDING)
     if form_types:
         q = q.filter(SecFiling.form_type.in_(form_types))
 
@@ -664,15 +648,7 @@ def main(argv: list[str] | None = None) -> None:
             # of failed rows and try again. Keep this bounded by --limit.
             if getattr(args, "retry_failed", False):
                 pending_now = (
-                    s.query(func.count(SecFiling.id))
-                    .filter(
-                        or_(
-                            SecFiling.fetch_status == None,  # noqa: E711
-                            SecFiling.fetch_status == "pending",
-                        )
-                    )
-                    .scalar()
-                    or 0
+                    s.query(func.count(SecFiling.id)).filter(_PENDING).scalar() or 0
                 )
                 if int(pending_now) == 0:
                     _requeue_failed_filings(
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import io
 import re
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session as SASession
 
 from db import Base, SessionLocal, engine
@@ -17,6 +19,17 @@ from utils.sec_edgar_api import fetch_rss_feed
 logger = get_logger(__name__)
 
 
+# Entry-text patterns, compiled once per process rather than looked up per entry.
+# 'CIK=0000320193' / 'cik=0000320193'
+_CIK_PARAM_RE = re.compile(r"\bCIK=([0-9]{1,10})\b", re.IGNORECASE)
+# Accessions sometimes appear as 0000320193-24-000001 in title.
+_ACCESSION_RE = re.compile(r"\b([0-9]{10}-[0-9]{2}-[0-9]{6})\b")
+# Form type often appears like '8-K' / '10-K' in title.
+_FORM_TYPE_RE = re.compile(r"\b([0-9]{1,3}[A-Z\-]{0,5}|S-1|S-3|F-1|F-3)\b")
+
+# Keys per `IN (...)` lookup (SQLite's default bound-parameter limit is 999).
+_IN_CLAUSE_BATCH_SIZE = 500
+
 _DEFAULT_ATOM_URL = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&CIK=&type=&company=&dateb=&owner=include&start=0&count=40&output=atom"
 
 
@@ -31,7 +44,7 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 
 def _extract_cik(text: str) -> str | None:
     # Common patterns in SEC feeds: 'CIK=0000320193' or 'cik=0000320193'
-    m = re.search(r"\bCIK=([0-9]{1,10})\b", text, flags=re.IGNORECASE)
+    m = _CIK_PARAM_RE.search(text)
     if not m:
         return None
     return m.group(1).zfill(10)
@@ -117,6 +130,26 @@ def _derive_edgar_urls(
     return (index_url, full_text_url, full_text_url)
 
 
+def _iter_entry_elements(atom_bytes: bytes):
+    """Yield each Atom `<entry>` element while parsing incrementally.
+
+    Entries are dropped from the tree once the caller is done with them, so memory
+    stays flat regardless of feed size. Namespaces are tolerated by matching the
+    local name, as before.
+    """
+
+    root = None
+    for event, el in ET.iterparse(io.BytesIO(atom_bytes), events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = el
+            continue
+        if el.tag.endswith("entry"):
+            yield el
+            # Entries are direct children of <feed>; drop the ones already seen.
+            root.clear()
+
+
 def parse_atom_entries(atom_bytes: bytes) -> list[dict]:
     """Parse SEC Atom feed into a small normalized entry dict list.
 
@@ -130,16 +163,8 @@ def parse_atom_entries(atom_bytes: bytes) -> list[dict]:
       - This is a best-effort parser for tests and basic ingestion; fields may be missing.
     """
 
-    root = ET.fromstring(atom_bytes)
-
-    # Atom namespace handling: tolerate missing namespace by matching localname.
-    def _iter_entries():
-        for el in root.iter():
-            if el.tag.endswith("entry"):
-                yield el
-
     out: list[dict] = []
-    for entry in _iter_entries():
+    for entry in _iter_entry_elements(atom_bytes):
         title = "".join(entry.findtext("{*}title") or "")
         summary = "".join(entry.findtext("{*}summary") or "")
 
@@ -154,15 +179,13 @@ def parse_atom_entries(atom_bytes: bytes) -> list[dict]:
 
         cik = _extract_cik(text) or _extract_cik_from_link(link)
 
-        # Accessions sometimes appear as 0000320193-24-000001 in title.
         acc = None
-        m_acc = re.search(r"\b([0-9]{10}-[0-9]{2}-[0-9]{6})\b", text)
+        m_acc = _ACCESSION_RE.search(text)
         if m_acc:
             acc = m_acc.group(1).replace("-", "")
 
-        # Form type often appears like '8-K' / '10-K' in title.
         form_type = None
-        m_form = re.search(r"\b([0-9]{1,3}[A-Z\-]{0,5}|S-1|S-3|F-1|F-3)\b", title)
+        m_form = _FORM_TYPE_RE.search(title)
         if m_form:
             form_type = m_form.group(1)
 
@@ -178,10 +201,63 @@ def parse_atom_entries(atom_bytes: bytes) -> list[dict]:
     return out
 
 
+def _chunks(keys: list, size: int = _IN_CLAUSE_BATCH_SIZE):
+    for i in range(0, len(keys), size):
+        yield keys[i : i + size]
+
+
+def _entity_ids_by_cik(session: SASession, ciks: set[str]) -> dict[str, int]:
+    """Map 10-digit CIKs to entity ids via `sec_cik` identifiers, in IN (...) batches."""
+
+    found: dict[str, int] = {}
+    for chunk in _chunks(sorted(ciks)):
+        stmt = select(EntityIdentifier.value, EntityIdentifier.entity_id).where(
+            EntityIdentifier.scheme == "sec_cik",
+            EntityIdentifier.value.in_(chunk),
+        )
+        found.update(session.execute(stmt).all())
+    return found
+
+
+def _existing_filing_keys(
+    session: SASession, accessions: set[str]
+) -> set[tuple[int, str]]:
+    """Return (entity_id, accession_number) pairs already stored for `accessions`."""
+
+    found: set[tuple[int, str]] = set()
+    for chunk in _chunks(sorted(accessions)):
+        stmt = select(SecFiling.entity_id, SecFiling.accession_number).where(
+            SecFiling.accession_number.in_(chunk)
+        )
+        found.update(session.execute(stmt).all())
+    return found
+
+
 def run_poll(*, session: SASession, url: str, limit: int = 50) -> dict[str, int]:
+    """Fetch the feed and insert pending sec_filings for entities we already know.
+
+    CIK -> entity_id and existing-filing lookups are resolved once per poll (see
+    `_entity_ids_by_cik` / `_existing_filing_keys`) and shared by all entries. They
+    are deliberately not memoized across polls: identifiers and filings can be
+    added between runs, and callers may pass sessions bound to different DBs.
+
+    Returns summary counts: inserted, unknown_cik, created_entities, entries.
+    """
+
     atom = fetch_rss_feed(url=url)
     entries = parse_atom_entries(atom)[: max(0, int(limit))]
 
+    # Entity identifiers in this DB are stored as 10-digit zero-padded CIKs.
+    # Resolve every CIK and existing filing up front: two lookups per poll
+    # instead of two per entry.
+    entity_ids = _entity_ids_by_cik(
+        session, {str(e["cik"]).zfill(10) for e in entries if e.get("cik")}
+    )
+    accessions = {
+        str(e["accession_number"]) for e in entries if e.get("accession_number")
+    }
+    existing = _existing_filing_keys(session, accessions)
+
     inserted = 0
     unknown = 0
     created_entities = 0
@@ -195,8 +271,6 @@ def run_poll(*, session: SASession, url: str, limit: int = 50) -> dict[str, int]
         if not cik:
             continue
 
-        # Entity identifiers in this DB are stored as non-zero-padded digits.
-        # Normalize to that format for lookup.
         cik_lookup = str(cik).zfill(10)
 
         # Derive URLs as best we can. This performs no external calls.
@@ -212,29 +286,23 @@ def run_poll(*, session: SASession, url: str, limit: int = 50) -> dict[str, int]
                 link,
             )
 
-        ident = (
-            session.query(EntityIdentifier)
-            .filter_by(scheme="sec_cik", value=cik_lookup)
-            .first()
-        )
-        if ident is None:
+        entity_id = entity_ids.get(cik_lookup)
+        if entity_id is None:
             unknown += 1
             continue
 
         if not acc or not form_type:
             continue
 
-        existing = (
-            session.query(SecFiling)
-            .filter_by(entity_id=ident.entity_id, accession_number=str(acc))
-            .first()
-        )
-        if existing is not None:
+        key = (entity_id, str(acc))
+        if key in existing:
             continue
+        # Also skips an accession repeated within the same feed.
+        existing.add(key)
 
         session.add(
             SecFiling(
-                entity_id=ident.entity_id,
+                entity_id=entity_id,
                 accession_number=str(acc),
                 form_type=str(form_type),
                 index_url=index_url,
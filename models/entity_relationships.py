@@ -34,11 +34,11 @@ class EntityRelationship(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
+    # No separate index: uq_entity_relationships_parent_child_type leads with it.
     parent_entity_id = Column(
         Integer,
         ForeignKey("entities.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     child_entity_id = Column(
         Integer,
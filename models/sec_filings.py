@@ -5,9 +5,11 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
+    text,
 )
 
 from db import Base
@@ -21,15 +23,21 @@ class SecFiling(Base):
             "accession_number",
             name="uq_sec_filings_entity_accession",
         ),
+        # Ingest work queue: only pending rows, in id order.
+        Index(
+            "ix_sec_filings_pending",
+            "id",
+            sqlite_where=text("fetch_status = 'pending'"),
+        ),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
+    # No separate index: uq_sec_filings_entity_accession leads with it.
     entity_id = Column(
         Integer,
         ForeignKey("entities.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # normalized: dashes removed
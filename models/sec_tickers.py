@@ -20,7 +20,8 @@ class SecTicker(Base):
         index=True,
     )
 
-    ticker = Column(String, nullable=False, index=True)
+    # No separate index: uq_sec_tickers_ticker_exchange leads with it.
+    ticker = Column(String, nullable=False)
     exchange = Column(String, nullable=True, index=True)
 
     # SQLite-friendly boolean (0/1)
@@ -10,32 +10,103 @@ These utilities keep tests small and consistent.
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+import functools
+from collections.abc import Iterable, Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import db as db_module
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from models import Base
+from utils.file_ops import load_json_file
 
 __all__ = [
     "make_sqlite_engine",
+    "make_shared_memory_engine",
     "create_empty_sqlite_db",
+    "transactional_session",
     "add_dicts",
     "add_json_like",
+    "seed_rows",
+    "bind_app_db",
     "patch_app_db",
+    "patch_ingest_globals",
+    "load_fixture",
+    "TEST_DATA_DIR",
 ]
 
+TEST_DATA_DIR = Path(__file__).resolve().parents[1] / "test_data"
+
+
+def _set_test_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    """Trade crash durability for speed; test DBs are throwaway."""
+
+    cursor = dbapi_connection.cursor()
+    # WAL matches what the ingestion scripts set on the same file (see
+    # populate_daily_values._configure_sqlite_for_concurrency), so the two never fight over it.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 
 def make_sqlite_engine(db_path: Path | str) -> Engine:
-    """Create a SQLite engine suitable for tests."""
+    """Create a SQLite engine suitable for tests (no fsync, in-memory temp store)."""
 
     if isinstance(db_path, Path):
         db_path = str(db_path)
-    return create_engine(f"sqlite:///{db_path}")
+    engine = create_engine(f"sqlite:///{db_path}")
+    event.listen(engine, "connect", _set_test_sqlite_pragmas)
+    return engine
+
+
+def make_shared_memory_engine(name: str = "memdb") -> Engine:
+    """Create an in-memory SQLite engine with all models, shareable across tests.
+
+    The database is a named shared-cache in-memory DB (`file:<name>`), so callers
+    should pass a per-process name (e.g. the pytest-xdist worker id) to keep workers
+    isolated. `StaticPool` keeps a single DBAPI connection so every checkout sees
+    the same database. pysqlite's own transaction handling is disabled in favour
+    of explicit `BEGIN` so SAVEPOINTs work, which lets each test run inside an
+    outer transaction that is rolled back on teardown (see `transactional_session`).
+    """
+
+    engine = create_engine(
+        f"sqlite:///file:{name}?mode=memory&cache=shared&uri=true",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def transactional_session(connection: Connection) -> Session:
+    """Session bound to `connection` whose commits only release SAVEPOINTs.
+
+    The caller owns the outer transaction on `connection` and rolls it back.
+    """
+
+    return Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    )
 
 
 def create_empty_sqlite_db(db_path: Path) -> tuple[Session, Engine]:
@@ -78,17 +149,84 @@ def add_json_like(session: Session, model, items: Iterable[Any]) -> None:
     session.commit()
 
 
-def patch_app_db(monkeypatch, engine: Engine) -> sessionmaker:
-    """Force Flask routes to use a provided SQLAlchemy engine.
+def seed_rows(session: Session, model, rows: Iterable[dict[str, Any]]) -> list[int]:
+    """Insert dict rows via a Core executemany INSERT and commit.
+
+    Skips ORM unit-of-work bookkeeping, which is all seed fixtures need.
+    Returns the new primary keys in the same order as `rows`.
+    """
+
+    table = model.__table__
+    stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+    ids = list(session.execute(stmt, list(rows)).scalars())
+    session.commit()
+    return ids
+
+
+def _app_sessionmaker(bind: Engine | Connection) -> tuple[Engine, sessionmaker]:
+    # join_transaction_mode only matters when bound to a Connection; it lets app
+    # sessions join the test's outer transaction via SAVEPOINTs.
+    SessionLocal = sessionmaker(
+        bind=bind, join_transaction_mode="create_savepoint", expire_on_commit=False
+    )
+    engine = bind.engine if isinstance(bind, Connection) else bind
+    return engine, SessionLocal
+
+
+def bind_app_db(bind: Engine | Connection) -> sessionmaker:
+    """Rebind the `db` module globals directly, without monkeypatch's restore stack.
+
+    Used once per test session (see `_bind_app_db` in conftest); the caller owns
+    restoring the previous globals. A no-op when `db.SessionLocal` is already
+    bound to `bind`.
+    """
+
+    if db_module.SessionLocal.kw.get("bind") is bind:
+        return db_module.SessionLocal
+    db_module.engine, db_module.SessionLocal = _app_sessionmaker(bind)
+    return db_module.SessionLocal
+
+
+def patch_app_db(monkeypatch, bind: Engine | Connection) -> sessionmaker:
+    """Force Flask routes to use a provided SQLAlchemy engine or connection.
 
     The application imports `SessionLocal` from `db` in multiple modules. For tests,
     we patch the `db` module globals so that all of those imports point at the
-    test engine.
+    test engine. When given a `Connection` (see `db_connection` in conftest), app
+    sessions join its outer transaction via SAVEPOINTs so the test can roll back.
+
+    Tests on the shared in-memory DB don't need this: `db_connection` already
+    points the session-wide binding at its connection.
 
     Returns the new SessionLocal (sessionmaker).
     """
 
-    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+    engine, SessionLocal = _app_sessionmaker(bind)
     monkeypatch.setattr(db_module, "engine", engine, raising=True)
     monkeypatch.setattr(db_module, "SessionLocal", SessionLocal, raising=True)
     return SessionLocal
+
+
+def patch_ingest_globals(monkeypatch, module, **globals_to_set: Any) -> None:
+    """Point an ingestion script module's DB globals at test objects.
+
+    Scripts like `utils.populate_daily_values` keep module-level `engine`,
+    `session` and `Session` globals; tests override them all in one call, e.g.
+    `patch_ingest_globals(monkeypatch, m, engine=engine, session=session)`.
+    """
+
+    for name, value in globals_to_set.items():
+        monkeypatch.setattr(module, name, value, raising=False)
+
+
+@functools.lru_cache(maxsize=None)
+def load_fixture(name: str) -> Mapping[str, Any]:
+    """Load and parse a JSON fixture from `test_data/` once per test session.
+
+    The parsed payload is cached and shared by every caller. The read-only mapping
+    is only a shallow guard: top-level keys can't be reassigned, but nested dicts
+    and lists are the cached objects themselves. Tests must `copy.deepcopy(...)`
+    the result before mutating anything nested.
+    """
+
+    return MappingProxyType(load_json_file(str(TEST_DATA_DIR / name)))
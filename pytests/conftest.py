@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime as dt
 import os
 import socket
 import threading
@@ -10,13 +11,20 @@ from typing import Generator
 import pytest
 from werkzeug.serving import make_server
 
+import db as db_module
 from app import create_app
 from models.daily_values import DailyValue
 from models.dates import DateEntry
 from models.entities import Entity
 from models.units import Unit
 from models.value_names import ValueName
-from pytests.common import create_empty_sqlite_db, patch_app_db
+from pytests.common import (
+    bind_app_db,
+    create_empty_sqlite_db,
+    make_shared_memory_engine,
+    patch_app_db,
+    transactional_session,
+)
 
 
 def _pick_free_port() -> int:
@@ -42,6 +50,30 @@ def browser_context_args():
     }
 
 
+@pytest.fixture(scope="module")
+def context(browser, browser_context_args):
+    """Share one Playwright browser context per test module.
+
+    Overrides the function-scoped `context` fixture from `pytest-playwright` (whose
+    `browser` fixture is already session-scoped) so only a new page is created per
+    test.
+    """
+
+    ctx = browser.new_context(**browser_context_args)
+    yield ctx
+    ctx.close()
+
+
+@pytest.fixture()
+def page(context):
+    """Fresh page per test on the shared module context; cookies are reset after."""
+
+    p = context.new_page()
+    yield p
+    p.close()
+    context.clear_cookies()
+
+
 def pytest_configure(config):
     """Pytest hook to configure environment for the test session.
 
@@ -60,6 +92,18 @@ def pytest_configure(config):
         datetime.now(timezone.utc).strftime("%Y-%m-%d_%H-%M-%S"),
     )
 
+    # Under pytest-xdist each worker inherits the controller's run id; suffix it
+    # with the worker id so processes never share (and rotate) the same log file.
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker_id and not os.environ["SEC_TEST_LOG_RUN_ID"].endswith(f"_{worker_id}"):
+        os.environ["SEC_TEST_LOG_RUN_ID"] += f"_{worker_id}"
+
+    # Share compiled Jinja templates across app instances and xdist workers.
+    if getattr(config, "cache", None) is not None:
+        os.environ.setdefault(
+            "JINJA_BYTECODE_CACHE_DIR", str(config.cache.mkdir("jinja_bytecode"))
+        )
+
     # Ensure directory exists before any module imports configure file handlers.
     try:
         os.makedirs(os.environ["SEC_TEST_LOG_DIR"], exist_ok=True)
@@ -67,6 +111,111 @@ def pytest_configure(config):
         pass
 
 
+@pytest.fixture(scope="session")
+def shared_engine():
+    """One in-memory SQLite engine (schema created once) per test process.
+
+    Named after the pytest-xdist worker so each worker gets its own database.
+    """
+
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    engine = make_shared_memory_engine(f"memdb_{worker_id}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Flask app built once per test process.
+
+    Routes resolve `db.SessionLocal` at request time, so per-test fixtures only need
+    to rebind the database; blueprints, Jinja loaders and logging setup are shared.
+    """
+
+    return create_app()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _bind_app_db(shared_engine):
+    """Point the `db` module at the shared in-memory engine for the whole session.
+
+    Done once with plain attribute assignment instead of a monkeypatch per route
+    test; `db_connection` only swaps the sessionmaker's bind.
+    """
+
+    original = (db_module.engine, db_module.SessionLocal)
+    bind_app_db(shared_engine)
+    yield
+    db_module.engine, db_module.SessionLocal = original
+
+
+@pytest.fixture()
+def db_connection(shared_engine):
+    """Connection with an open outer transaction, rolled back after each test.
+
+    App sessions (`db.SessionLocal`) are bound to this connection for the duration
+    of the test; pair with `transactional_session(...)` for seeding so seed data
+    and app writes never leak between tests.
+    """
+
+    connection = shared_engine.connect()
+    trans = connection.begin()
+    SessionLocal = db_module.SessionLocal
+    SessionLocal.configure(bind=connection)
+    try:
+        yield connection
+    finally:
+        SessionLocal.configure(bind=shared_engine)
+        trans.rollback()
+        connection.close()
+
+
+@pytest.fixture()
+def db_session(db_connection):
+    """ORM session on the shared engine; everything it writes is rolled back."""
+
+    session = transactional_session(db_connection)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def seeded_entity(db_connection) -> int:
+    """Seed one entity with a single USD "Assets" daily value; returns its id.
+
+    Shared by the check-cik and daily-values route tests. Rows are written inside
+    the `db_connection` outer transaction, so they are rolled back after each test.
+    """
+
+    session = transactional_session(db_connection)
+
+    # The outer transaction starts from an empty DB, so ids can be assigned up front
+    # and every table seeded with one executemany (no flush/lastrowid round-trips).
+    entity_id = date_id = unit_id = value_name_id = 1
+    session.bulk_insert_mappings(Entity, [{"id": entity_id, "cik": "0000000001"}])
+    session.bulk_insert_mappings(DateEntry, [{"id": date_id, "date": dt.date(2020, 1, 1)}])
+    session.bulk_insert_mappings(Unit, [{"id": unit_id, "name": "USD"}])
+    session.bulk_insert_mappings(
+        ValueName, [{"id": value_name_id, "name": "Assets", "unit_id": unit_id}]
+    )
+    session.bulk_insert_mappings(
+        DailyValue,
+        [
+            {
+                "entity_id": entity_id,
+                "date_id": date_id,
+                "value_name_id": value_name_id,
+                "value": 123,
+            }
+        ],
+    )
+    session.commit()
+    session.close()
+    return entity_id
+
+
 @pytest.fixture()
 def seeded_live_server(tmp_path, monkeypatch) -> Generator[LiveServer, None, None]:
     """Start a real HTTP server (thread) backed by a temp SQLite DB.
@@ -89,8 +238,6 @@ def seeded_live_server(tmp_path, monkeypatch) -> Generator[LiveServer, None, Non
     session.add_all([e1, e2])
     session.flush()
 
-    import datetime as dt
-
     d = DateEntry(date=dt.date(2020, 1, 1))
     u = Unit(name="USD")
     vn = ValueName(name="Assets")
@@ -0,0 +1,70 @@
+"""Raw `sqlite3` helpers for migration tests.
+
+The migration helpers under test operate on DB-API cursors rather than SQLAlchemy
+sessions, so these utilities stay on plain `sqlite3` as well.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+__all__ = ["connect", "executescript", "table_columns", "table_columns_many"]
+
+# Test DBs live under tmp_path and are thrown away, so durability buys nothing:
+# skip the fsync on every commit and keep the rollback journal off disk.
+_EPHEMERAL_PRAGMAS = "PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY;"
+
+
+def connect(db_path: Path | str) -> sqlite3.Connection:
+    """Open `db_path` with default commit semantics and no-fsync pragmas."""
+
+    con = sqlite3.connect(db_path)
+    con.executescript(_EPHEMERAL_PRAGMAS)
+    return con
+
+
+def executescript(db_path: Path | str, script: str) -> None:
+    """Run setup DDL/DML against `db_path` in one autocommit `executescript` pass.
+
+    Uses a dedicated connection with `isolation_level=None` so the setup does not
+    go through the implicit-transaction machinery, and so the connection used for
+    the migration under test keeps its default commit semantics.
+    """
+
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as con:
+        con.executescript(_EPHEMERAL_PRAGMAS + script)
+
+
+def table_columns(cur: sqlite3.Cursor, table: str) -> frozenset[str]:
+    """Return the column names of `table` from a single `PRAGMA table_info` scan."""
+
+    pragma_cur = cur.connection.cursor()
+    pragma_cur.row_factory = sqlite3.Row
+    try:
+        pragma_cur.execute(f"PRAGMA table_info({table})")
+        return frozenset(row["name"] for row in pragma_cur)
+    finally:
+        pragma_cur.close()
+
+
+def table_columns_many(
+    cur: sqlite3.Cursor, tables: tuple[str, ...]
+) -> dict[str, frozenset[str]]:
+    """Return column names for several tables in one `pragma_table_info` join.
+
+    Tables that do not exist are reported with an empty set.
+    """
+
+    placeholders = ",".join("?" * len(tables))
+    cur.execute(
+        "SELECT m.name, p.name FROM sqlite_master AS m "
+        "JOIN pragma_table_info(m.name) AS p "
+        f"WHERE m.type = 'table' AND m.name IN ({placeholders})",
+        tables,
+    )
+    cols: dict[str, set[str]] = {t: set() for t in tables}
+    for table, col in cur.fetchall():
+        cols[table].add(col)
+    return {t: frozenset(c) for t, c in cols.items()}
@@ -23,15 +23,10 @@ def client(tmp_path, monkeypatch):
     patch_app_db(monkeypatch, engine)
 
     e = Entity(cik="0000000003")
-    session.add(e)
-    session.flush()
-
     d = DateEntry(date=date(2024, 1, 2))
-    session.add(d)
-    session.flush()
-
     u = Unit(name="NA")
-    session.add(u)
+    session.add_all([e, d, u])
+    # ValueName has no relationship to Unit, so its unit_id needs a flushed id.
     session.flush()
 
     # ValueName may or may not have unit_id depending on migrations; set only if present.
@@ -39,11 +34,10 @@ def client(tmp_path, monkeypatch):
     if hasattr(ValueName, "unit_id"):
         vn_kwargs["unit_id"] = u.id
     vn = ValueName(**vn_kwargs)
-    session.add(vn)
-    session.flush()
 
-    dv = DailyValue(entity_id=e.id, date_id=d.id, value_name_id=vn.id, value="10-K")
-    session.add(dv)
+    # Relationships let the unit of work order the remaining INSERTs at commit.
+    dv = DailyValue(entity=e, date=d, value_name=vn, value="10-K")
+    session.add_all([vn, dv])
 
     session.commit()
     session.close()
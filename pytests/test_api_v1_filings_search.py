@@ -7,7 +7,7 @@ import pytest
 from app import create_app
 from models.entities import Entity
 from models.sec_filings import SecFiling
-from pytests.common import create_empty_sqlite_db, patch_app_db
+from pytests.common import create_empty_sqlite_db, patch_app_db, seed_rows
 
 
 @pytest.fixture()
@@ -16,12 +16,10 @@ def client(tmp_path, monkeypatch):
     patch_app_db(monkeypatch, engine)
 
     # Seed one entity + one local filing.
-    e = Entity(cik="0000000001")
-    session.add(e)
-    session.flush()
+    (entity_id,) = seed_rows(session, Entity, [{"cik": "0000000001"}])
 
-    f = SecFiling(
-        entity_id=e.id,
+    f = dict(
+        entity_id=entity_id,
         accession_number="000000000120000001",
         form_type="10-K",
         filing_date=date(2024, 1, 5),
@@ -31,8 +29,7 @@ def client(tmp_path, monkeypatch):
         fetch_status="pending",
         source="sec_submissions_local",
     )
-    session.add(f)
-    session.commit()
+    seed_rows(session, SecFiling, [f])
     session.close()
 
     app = create_app()
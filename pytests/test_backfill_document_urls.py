@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+
+from models.entities import Entity
+from models.sec_filings import SecFiling
+from pytests.common import create_empty_sqlite_db, patch_app_db
+from scripts import backfill_document_urls as backfill
+
+INDEX_URL = "https://www.sec.gov/Archives/edgar/data/320193/000032019324000001/"
+
+
+def _seed(session) -> dict[str, int]:
+    entity = Entity(cik="0000320193")
+    session.add(entity)
+    session.flush()
+
+    filings = {
+        "missing": SecFiling(
+            entity_id=entity.id,
+            accession_number="0000320193-24-000001",
+            form_type="10-K",
+            index_url=INDEX_URL,
+        ),
+        "no_cik": SecFiling(
+            entity_id=entity.id,
+            accession_number="0000320193-24-000002",
+            form_type="10-Q",
+            index_url="https://example.com/filing",
+        ),
+        "has_url": SecFiling(
+            entity_id=entity.id,
+            accession_number="0000320193-24-000003",
+            form_type="8-K",
+            index_url=INDEX_URL,
+            document_url="https://example.com/keep.txt",
+        ),
+    }
+    session.add_all(filings.values())
+    session.commit()
+    return {k: f.id for k, f in filings.items()}
+
+
+def _document_urls(session) -> dict[int, str | None]:
+    session.expire_all()
+    return dict(session.execute(select(SecFiling.id, SecFiling.document_url)).all())
+
+
+@pytest.mark.parametrize("update_from", [True, False], ids=["update_from", "executemany"])
+def test_backfill_document_urls_fills_missing_urls(tmp_path, monkeypatch, update_from):
+    session, engine = create_empty_sqlite_db(tmp_path / "backfill.sqlite")
+    ids = _seed(session)
+    patch_app_db(monkeypatch, engine)
+    monkeypatch.setattr(backfill, "UPDATE_BATCH_SIZE", 1)
+    monkeypatch.setattr(
+        backfill,
+        "_SQLITE_HAS_UPDATE_FROM",
+        backfill._SQLITE_HAS_UPDATE_FROM and update_from,
+    )
+
+    summary = backfill.backfill_document_urls()
+
+    assert summary == {"found": 2, "updated": 1, "skipped": 1}
+    urls = _document_urls(session)
+    assert urls[ids["missing"]] == (
+        "https://www.sec.gov/Archives/edgar/data/320193/"
+        "000032019324000001/0000320193-24-000001.txt"
+    )
+    assert urls[ids["no_cik"]] is None
+    assert urls[ids["has_url"]] == "https://example.com/keep.txt"
+
+
+def test_backfill_document_urls_dry_run_writes_nothing(tmp_path, monkeypatch):
+    session, engine = create_empty_sqlite_db(tmp_path / "backfill_dry.sqlite")
+    ids = _seed(session)
+    patch_app_db(monkeypatch, engine)
+
+    summary = backfill.backfill_document_urls(dry_run=True)
+
+    assert summary == {"found": 2, "updated": 1, "skipped": 1}
+    assert _document_urls(session)[ids["missing"]] is None
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        (INDEX_URL, "320193"),
+        ("https://www.sec.gov/Archives/edgar/data/320193", "320193"),
+        ("https://www.sec.gov/Archives/edgar/data/abc/0001/", None),
+        ("https://www.sec.gov/Archives/edgar/data/12ab/", None),
+        ("https://example.com/filing", None),
+        (None, None),
+    ],
+)
+def test_infer_cik_from_url(url, expected):
+    assert backfill._infer_cik_from_url(url) == expected
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+
+from utils import cleanup_logs
+
+
+def _make_logs(logs_dir, ages_days: dict[str, float]) -> None:
+    now = os.path.getmtime(logs_dir)
+    for rel, age in ages_days.items():
+        path = logs_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+        mtime = now - age * 86400
+        os.utime(path, (mtime, mtime))
+
+
+def _remaining(logs_dir) -> set[str]:
+    return {
+        p.relative_to(logs_dir).as_posix() for p in logs_dir.rglob("*") if p.is_file()
+    }
+
+
+def test_iter_log_files_is_recursive_and_newest_first(tmp_path):
+    _make_logs(tmp_path, {"old.log": 10, "sub/mid.log": 5, "new.log": 1})
+    (tmp_path / "empty_dir").mkdir()
+
+    files = cleanup_logs._iter_log_files(tmp_path)
+
+    assert [c.path.name for c in files] == ["new.log", "mid.log", "old.log"]
+    assert all(c.size > 0 for c in files)
+
+
+def test_iter_log_files_does_not_follow_symlinked_dirs(tmp_path):
+    outside = tmp_path / "outside"
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir()
+    _make_logs(outside.parent, {"outside/keep.log": 1})
+    _make_logs(logs_dir, {"a.log": 1})
+    (logs_dir / "link").symlink_to(outside, target_is_directory=True)
+
+    assert [c.path.name for c in cleanup_logs._iter_log_files(logs_dir)] == ["a.log"]
+
+
+def test_iter_log_files_missing_dir(tmp_path):
+    assert cleanup_logs._iter_log_files(tmp_path / "missing") == []
+
+
+def test_cleanup_logs_age_keep_and_cap(tmp_path):
+    _make_logs(
+        tmp_path,
+        {"a.log": 1, "b.log": 2, "sub/c.log": 3, "d.log": 20, "sub/e.log": 30},
+    )
+
+    rc = cleanup_logs.cleanup_logs(
+        logs_dir=tmp_path,
+        keep_newest=1,
+        max_age_days=10,
+        max_total_files=2,
+        dry_run=False,
+    )
+
+    assert rc == 0
+    # d/e are past the age cutoff; c is the oldest survivor beyond the cap of 2.
+    assert _remaining(tmp_path) == {"a.log", "b.log"}
+    assert (tmp_path / "sub").is_dir()
+
+
+def test_cleanup_logs_dry_run_deletes_nothing(tmp_path, capsys):
+    _make_logs(tmp_path, {"a.log": 1, "sub/b.log": 2})
+
+    rc = cleanup_logs.cleanup_logs(
+        logs_dir=tmp_path,
+        keep_newest=1,
+        max_age_days=0,
+        max_total_files=None,
+        dry_run=True,
+    )
+
+    assert rc == 0
+    assert _remaining(tmp_path) == {"a.log", "sub/b.log"}
+    out = capsys.readouterr().out.splitlines()
+    assert f"DRY-RUN delete: {tmp_path / 'sub' / 'b.log'} (age 2.0d)" in out
+    assert f"DRY-RUN keep (protected): {tmp_path / 'a.log'}" in out
+
+
+def test_cleanup_logs_delete_all(tmp_path, monkeypatch):
+    _make_logs(tmp_path, {"a.log": 1, "sub/b.log": 2, "sub/deeper/c.log": 3})
+
+    def _no_scan(_logs_dir):
+        raise AssertionError("delete-all should not build the candidate list")
+
+    monkeypatch.setattr(cleanup_logs, "_iter_log_files", _no_scan)
+
+    rc = cleanup_logs.cleanup_logs(
+        logs_dir=tmp_path,
+        keep_newest=0,
+        max_age_days=0,
+        max_total_files=None,
+        dry_run=False,
+    )
+
+    assert rc == 0
+    assert _remaining(tmp_path) == set()
+    assert (tmp_path / "sub" / "deeper").is_dir()
+
+
+def test_cleanup_logs_delete_all_keeps_files_written_during_run(tmp_path):
+    _make_logs(tmp_path, {"a.log": 1, "live.log": -1})
+
+    rc = cleanup_logs.cleanup_logs(
+        logs_dir=tmp_path,
+        keep_newest=0,
+        max_age_days=0,
+        max_total_files=None,
+        dry_run=False,
+    )
+
+    assert rc == 0
+    assert _remaining(tmp_path) == {"live.log"}
+
+
+def test_unlink_files_counts_errors_and_continues(tmp_path, capsys):
+    _make_logs(tmp_path, {"a.log": 1, "sub/b.log": 1})
+    paths = [tmp_path / "a.log", tmp_path / "gone.log", tmp_path / "sub" / "b.log"]
+
+    assert cleanup_logs._unlink_files(paths) == (2, 1)
+    assert _remaining(tmp_path) == set()
+    assert "gone.log" in capsys.readouterr().err
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import sqlite3
 
+from pytests.sqlite_helpers import connect
 from utils.migrate_sqlite_schema import (
     create_data_sources_table_if_missing,
     seed_data_sources_if_missing,
@@ -22,7 +23,7 @@ def _rows(cur: sqlite3.Cursor) -> list[tuple[str, str]]:
 
 def test_data_sources_table_and_seed_rows_are_idempotent(tmp_path) -> None:
     db_path = tmp_path / "ds.sqlite"
-    con = sqlite3.connect(db_path)
+    con = connect(db_path)
     try:
         cur = con.cursor()
 
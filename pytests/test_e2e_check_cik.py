@@ -7,33 +7,40 @@ import pytest
 playwright = pytest.importorskip("playwright")
 from playwright.sync_api import Page, expect  # type: ignore
 
+_DAILY_VALUES_URL_RE = re.compile(r".*/daily-values(\?.*)?$")
+
 
 def test_check_cik_cards_expand_and_navigate(page: Page, seeded_live_server):
     page.goto(f"{seeded_live_server.base_url}/check-cik", wait_until="domcontentloaded")
+    page.wait_for_load_state("networkidle")
 
-    # At least one card should be present.
+    # Cards are server-rendered, so the DOM is settled once the page has loaded;
+    # single-shot assertions avoid `expect(...)` retry polling.
     cards = page.locator("details.cik-card")
-    expect(cards).to_have_count(2)
+    assert cards.count() == 2
 
     first = cards.nth(0)
 
     # Expand the first card.
     first.locator("summary").click()
-    expect(first).to_have_attribute("open", "")
+    page.wait_for_function("el => el.hasAttribute('open')", arg=first.element_handle())
+    assert first.get_attribute("open") is not None
 
     # Button exists and navigates to daily values.
     open_btn = first.get_by_role("link", name="Open daily values")
-    expect(open_btn).to_be_visible()
+    assert open_btn.is_visible()
 
     open_btn.click()
-    expect(page).to_have_url(re.compile(r".*/daily-values(\?.*)?$"))
+    # Navigation is genuinely async; keep the waiting assertion but fail fast.
+    expect(page).to_have_url(_DAILY_VALUES_URL_RE, timeout=2000)
+    page.wait_for_load_state("domcontentloaded")
 
     # Daily values page should render a table.
-    expect(page.locator("table")).to_be_visible()
+    assert page.locator("table").is_visible()
 
 
 def test_check_cik_load_more_button_hidden_when_no_more(page: Page, seeded_live_server):
     page.goto(f"{seeded_live_server.base_url}/check-cik", wait_until="domcontentloaded")
 
     # With only 2 seeded entities, the button should not exist.
-    expect(page.locator("#load-more")).to_have_count(0)
+    assert page.locator("#load-more").count() == 0
@@ -24,12 +24,13 @@ def uninitialized_db_client(tmp_path, monkeypatch):
     patch_app_db(monkeypatch, engine)
 
     app = create_app()
-    return app.test_client(), engine
+    with app.test_client() as c:
+        yield c, engine
 
+    engine.dispose()
 
-def test_service_handles_missing_tables(uninitialized_db_client):
-    _client, engine = uninitialized_db_client
 
+def test_service_handles_missing_tables(uninitialized_db_client):
     session = db_module.SessionLocal()
     try:
         assert svc.count_entities_with_daily_values(session) == 0
@@ -38,34 +39,25 @@ def test_service_handles_missing_tables(uninitialized_db_client):
         )
     finally:
         session.close()
-        engine.dispose()
 
 
 def test_check_cik_renders_empty_state_html(uninitialized_db_client):
-    client, engine = uninitialized_db_client
-    try:
-        resp = client.get("/check-cik")
-        assert resp.status_code == 200
-        assert resp.mimetype == "text/html"
-        body = resp.get_data(as_text=True)
-        assert "No companies found yet" in body
-    finally:
-        engine.dispose()
+    client, _engine = uninitialized_db_client
+    resp = client.get("/check-cik")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/html"
+    body = resp.get_data(as_text=True)
+    assert "No companies found yet" in body
 
 
 def test_check_cik_empty_state_json(uninitialized_db_client):
-    client, engine = uninitialized_db_client
-    try:
-        resp = client.get(
-            "/check-cik?format=json", headers={"Accept": "application/json"}
-        )
-        assert resp.status_code == 200
-        assert resp.mimetype == "application/json"
-        payload = resp.get_json()
-
-        assert payload["total"] == 0
-        assert payload["count"] == 0
-        assert payload["cards"] == []
-        assert payload["has_more"] is False
-    finally:
-        engine.dispose()
+    client, _engine = uninitialized_db_client
+    resp = client.get("/check-cik?format=json", headers={"Accept": "application/json"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/json"
+    payload = resp.get_json()
+
+    assert payload["total"] == 0
+    assert payload["count"] == 0
+    assert payload["cards"] == []
+    assert payload["has_more"] is False
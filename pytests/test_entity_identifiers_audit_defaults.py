@@ -1,26 +1,19 @@
 from __future__ import annotations
 
+from models.entity_identifiers import EntityIdentifier
+from utils import populate_daily_values
 from utils.populate_daily_values import get_or_create_entity_by_identifier
 from utils.time_utils import ensure_utc, utcnow
 
 
 def test_new_entity_identifier_sets_audit_defaults(tmp_path, monkeypatch) -> None:
     # Use a temp DB via the existing test helper.
-    from pytests.common import create_empty_sqlite_db
+    from pytests.common import create_empty_sqlite_db, patch_ingest_globals
 
     session, engine = create_empty_sqlite_db(tmp_path / "t.sqlite")
 
     # Patch ingestion module globals so it uses our temp DB session.
-    monkeypatch.setattr(
-        "utils.populate_daily_values.session",
-        session,
-        raising=False,
-    )
-    monkeypatch.setattr(
-        "utils.populate_daily_values.engine",
-        engine,
-        raising=False,
-    )
+    patch_ingest_globals(monkeypatch, populate_daily_values, session=session, engine=engine)
 
     before = utcnow()
     ent = get_or_create_entity_by_identifier(
@@ -29,12 +22,10 @@ def test_new_entity_identifier_sets_audit_defaults(tmp_path, monkeypatch) -> Non
         session=session,
         issuer="sec",
     )
-    session.commit()
+    session.flush()
 
     ident = (
-        session.query(
-            __import__("models.entity_identifiers").entity_identifiers.EntityIdentifier
-        )
+        session.query(EntityIdentifier)
         .filter_by(entity_id=ent.id, scheme="sec_cik")
         .first()
     )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import uuid
+
 import pytest
 
 from utils.entity_identity import derive_relationship_child_canonical_uuid
@@ -46,3 +48,20 @@ def test_derive_relationship_child_canonical_uuid_changes_on_input_change(
     u_changed = derive_relationship_child_canonical_uuid(**base_kwargs)
 
     assert u_base != u_changed
+
+
+@pytest.mark.parametrize("child_value", ["0000320193", "Société Générale", "x" * 300])
+def test_derive_relationship_child_canonical_uuid_matches_stdlib_uuid5(
+    child_value: str,
+) -> None:
+    kw = dict(
+        parent_canonical_uuid="parent123",
+        relationship_type="subsidiary",
+        child_scheme="sec_cik",
+        child_value=child_value,
+    )
+    expected = uuid.uuid5(
+        uuid.NAMESPACE_URL, f"parent123:subsidiary:sec_cik:{child_value}"
+    ).hex
+
+    assert derive_relationship_child_canonical_uuid(**kw) == expected
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import pytest
+
+from utils import file_ops
+
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_load_json_file_parses_utf8(tmp_path, monkeypatch, use_orjson):
+    if use_orjson and file_ops.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(file_ops, "orjson", None)
+
+    path = tmp_path / "CIK0000000001.json"
+    path.write_text('{"cik": "1", "name": "Société Générale", "tickers": []}', encoding="utf-8")
+
+    assert file_ops.load_json_file(str(path)) == {
+        "cik": "1",
+        "name": "Société Générale",
+        "tickers": [],
+    }
+
+
+def test_load_json_file_raises_value_error_on_bad_json(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_bytes(b"{not json")
+
+    with pytest.raises(ValueError):
+        file_ops.load_json_file(str(path))
@@ -1,74 +1,51 @@
 from __future__ import annotations
 
-import importlib
-import json
-from pathlib import Path
+from functools import lru_cache
+
+from sqlalchemy import select
 
 from models.entities import Entity
 from models.file_processing import FileProcessing
-from pytests.common import create_empty_sqlite_db
-
-
-def _load_script_module():
-    return importlib.import_module("utils.populate_daily_values")
-
-
-def _load_fixture(name: str) -> dict:
-    p = Path(__file__).resolve().parents[1] / "test_data" / name
-    return json.loads(p.read_text(encoding="utf-8"))
+from pytests.common import (
+    create_empty_sqlite_db,
+    load_fixture,
+    patch_ingest_globals,
+    seed_rows,
+)
+from utils import populate_daily_values as m
 
 
 def test_companyfacts_ingestion_marks_record_count(tmp_path, monkeypatch) -> None:
     session, engine = create_empty_sqlite_db(tmp_path / "fp_rc.sqlite")
-    m = _load_script_module()
 
     # Patch script globals to the temp test DB.
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "session", session, raising=False)
-    monkeypatch.setattr(m, "Session", lambda: session, raising=False)
+    patch_ingest_globals(monkeypatch, m, engine=engine, session=session, Session=lambda: session)
 
-    data = _load_fixture("companyfacts_sample.json")
+    data = load_fixture("companyfacts_sample.json")
 
     # Ensure entity exists (companyfacts identifies by cik in the payload).
-    entity = Entity(cik="0000000003")
-    session.add(entity)
-    session.flush()
+    (entity_id,) = seed_rows(session, Entity, [{"cik": "0000000003"}])
 
     # Minimal caches.
-    unit_cache: dict[str, int] = {}
-    value_name_cache: dict[tuple[str, int | None], int] = {}
-    date_cache: dict[str, int] = {}
-
+    @lru_cache(maxsize=None)
     def get_unit_id_cached(unit_name: str | None) -> int:
         key = (unit_name or "NA").strip() or "NA"
-        if key in unit_cache:
-            return unit_cache[key]
-        unit_cache[key] = m.get_or_create_unit(key, session=session).id
-        return unit_cache[key]
+        return m.get_or_create_unit(key, session=session).id
 
+    @lru_cache(maxsize=None)
     def get_value_name_id_cached(name: str, unit_id: int | None) -> int:
-        key = (name, unit_id)
-        if key in value_name_cache:
-            return value_name_cache[key]
-        value_name_cache[key] = m.get_or_create_value_name(
-            name, unit_id=unit_id, session=session
-        ).id
-        return value_name_cache[key]
+        return m.get_or_create_value_name(name, unit_id=unit_id, session=session).id
 
+    @lru_cache(maxsize=None)
     def get_date_id_cached(date_str: str) -> int | None:
-        if date_str in date_cache:
-            return date_cache[date_str]
         de = m.get_or_create_date_entry(date_str, session=session)
-        if not de:
-            return None
-        date_cache[date_str] = de.id
-        return de.id
+        return de.id if de else None
 
     planned, dups = m.process_companyfacts_file(
         data=data,
         source="companyfacts",
         filename="companyfacts_sample.json",
-        entity_id=entity.id,
+        entity_id=entity_id,
         get_unit_id_cached=get_unit_id_cached,
         get_value_name_id_cached=get_value_name_id_cached,
         get_date_id_cached=get_date_id_cached,
@@ -79,15 +56,17 @@ def test_companyfacts_ingestion_marks_record_count(tmp_path, monkeypatch) -> Non
     # Mark file processed as the worker loop does.
     m._mark_file_processed(
         session,
-        entity_id=entity.id,
+        entity_id=entity_id,
         source_file="companyfacts:companyfacts_sample.json",
         source="local",
         record_count=planned,
     )
     session.commit()
 
-    fp = session.query(FileProcessing).first()
-    assert fp is not None
-    assert fp.source == "local"
-    assert fp.record_count == planned
-    assert fp.record_count >= 1
+    row = session.execute(
+        select(FileProcessing.source, FileProcessing.record_count).limit(1)
+    ).first()
+    assert row is not None
+    assert row.source == "local"
+    assert row.record_count == planned
+    assert row.record_count >= 1
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 from sqlalchemy.exc import IntegrityError
 
+from utils import populate_daily_values as m
 from utils.populate_daily_values import get_or_create_entity_by_identifier
 
 
@@ -18,7 +19,7 @@ def test_get_or_create_entity_by_identifier_raises_on_conflict(tmp_path) -> None
             session=session,
             issuer="sec",
         )
-        session.commit()
+        session.flush()
 
         # Second call attempts to claim same (scheme,value) from a different entity.
         # We do this by creating a new entity using a different identifier, then
@@ -29,9 +30,7 @@ def test_get_or_create_entity_by_identifier_raises_on_conflict(tmp_path) -> None
             session=session,
             issuer="gleif",
         )
-        session.commit()
-
-        m = __import__("utils.populate_daily_values").populate_daily_values
+        session.flush()
 
         with pytest.raises(
             IntegrityError, match=r"Identifier conflict: sec_cik:0000320193"
@@ -47,3 +46,60 @@ def test_get_or_create_entity_by_identifier_raises_on_conflict(tmp_path) -> None
     finally:
         session.close()
         engine.dispose()
+
+
+def test_bulk_identifier_insert_raises_when_value_claimed_after_preload(
+    tmp_path, monkeypatch
+) -> None:
+    from pytests.common import create_empty_sqlite_db
+
+    session, engine = create_empty_sqlite_db(tmp_path / "race.sqlite")
+    try:
+        e1 = get_or_create_entity_by_identifier(
+            scheme="sec_cik", value="0000320193", session=session, issuer="sec"
+        )
+        e2 = get_or_create_entity_by_identifier(
+            scheme="sec_cik", value="0000789019", session=session, issuer="sec"
+        )
+        session.flush()
+        assert e1.id != e2.id
+
+        # Another writer inserted the value between the preload SELECT and the
+        # INSERT: the preload sees nothing, so only the INSERT can catch it.
+        monkeypatch.setattr(session, "scalars", lambda stmt: iter(()))
+        with pytest.raises(IntegrityError):
+            m._upsert_entity_identifiers_bulk(
+                session, entity_id=e2.id, scheme="sec_cik", values=["0000320193"]
+            )
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_bulk_ticker_insert_raises_when_ticker_claimed_after_preload(
+    tmp_path, monkeypatch
+) -> None:
+    from pytests.common import create_empty_sqlite_db
+
+    session, engine = create_empty_sqlite_db(tmp_path / "ticker_race.sqlite")
+    try:
+        e1 = get_or_create_entity_by_identifier(
+            scheme="sec_cik", value="0000320193", session=session, issuer="sec"
+        )
+        e2 = get_or_create_entity_by_identifier(
+            scheme="sec_cik", value="0000789019", session=session, issuer="sec"
+        )
+        session.flush()
+        m._process_submission_tickers(
+            {"tickers": ["AAPL"], "exchanges": ["Nasdaq"]}, e1, session
+        )
+
+        # Another writer claimed the ticker between the preload and the INSERT.
+        monkeypatch.setattr(m, "_load_existing_sec_tickers", lambda s, t: {})
+        with pytest.raises(IntegrityError, match=r"sec_tickers\.ticker"):
+            m._process_submission_tickers(
+                {"tickers": ["AAPL"], "exchanges": ["Nasdaq"]}, e2, session
+            )
+    finally:
+        session.close()
+        engine.dispose()
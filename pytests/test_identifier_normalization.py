@@ -1,67 +1,72 @@
 from __future__ import annotations
 
-import importlib
+from utils import populate_daily_values as m
 
-import pytest
+# Table-driven cases: each test loops over its table and reports every failing
+# case at once (cheaper than one pytest node per microsecond-sized check).
+_VALID_CASES = [
+    ("gleif_lei", "5493001KJTIIGC8Y1R12", "5493001KJTIIGC8Y1R12"),
+    ("gleif_lei", "5493001kjtiigc8y1r12", "5493001KJTIIGC8Y1R12"),
+    ("isin", "us0378331005", "US0378331005"),
+    ("gb_companies_house", "1234567", "01234567"),
+    ("gb_companies_house", "00001234", "00001234"),
+    ("fr_siren", "552 100 554", "552100554"),
+    ("eu_vat", "de 123 456 789", "DE123456789"),
+    ("ticker_exchange", "aapl:xnas", "AAPL:XNAS"),
+    ("ticker_exchange", " AAPL : XNAS ", "AAPL:XNAS"),
+]
 
+_INVALID_CASES = [
+    ("gleif_lei", "SHORT"),
+    ("gleif_lei", "!" * 20),
+    ("isin", "TOO-SHORT"),
+    ("gb_companies_house", "123456789"),
+    ("fr_siren", "123"),
+    ("eu_vat", "   "),
+    ("ticker_exchange", "AAPL"),
+    ("ticker_exchange", ":XNAS"),
+    ("ticker_exchange", "AAPL:"),
+]
 
-def _m():
-    return importlib.import_module("utils.populate_daily_values")
+_ALIAS_CASES = [
+    ("sec", "sec_cik"),
+    ("CIK", "sec_cik"),
+    ("gleif", "gleif_lei"),
+    ("companies_house", "gb_companies_house"),
+    ("siren", "fr_siren"),
+    ("vat", "eu_vat"),
+    ("ticker", "ticker_exchange"),
+]
 
 
-@pytest.mark.parametrize(
-    "scheme,value,expected",
-    [
-        ("gleif_lei", "5493001KJTIIGC8Y1R12", "5493001KJTIIGC8Y1R12"),
-        ("gleif_lei", "5493001kjtiigc8y1r12", "5493001KJTIIGC8Y1R12"),
-        ("isin", "us0378331005", "US0378331005"),
-        ("gb_companies_house", "1234567", "01234567"),
-        ("gb_companies_house", "00001234", "00001234"),
-        ("fr_siren", "552 100 554", "552100554"),
-        ("eu_vat", "de 123 456 789", "DE123456789"),
-        ("ticker_exchange", "aapl:xnas", "AAPL:XNAS"),
-        ("ticker_exchange", " AAPL : XNAS ", "AAPL:XNAS"),
-    ],
-)
-def test_normalize_identifier_value_valid(
-    scheme: str, value: str, expected: str
-) -> None:
-    m = _m()
-    assert m._normalize_identifier_value(scheme, value) == expected
+def test_normalize_identifier_value_valid() -> None:
+    failures = []
+    for scheme, value, expected in _VALID_CASES:
+        try:
+            got = m._normalize_identifier_value(scheme, value)
+        except ValueError as exc:
+            failures.append(f"{scheme}:{value!r} raised {exc!r}")
+            continue
+        if got != expected:
+            failures.append(f"{scheme}:{value!r} -> {got!r}, expected {expected!r}")
+    assert not failures, "\n".join(failures)
 
 
-@pytest.mark.parametrize(
-    "scheme,value",
-    [
-        ("gleif_lei", "SHORT"),
-        ("gleif_lei", "!" * 20),
-        ("isin", "TOO-SHORT"),
-        ("gb_companies_house", "123456789"),
-        ("fr_siren", "123"),
-        ("eu_vat", "   "),
-        ("ticker_exchange", "AAPL"),
-        ("ticker_exchange", ":XNAS"),
-        ("ticker_exchange", "AAPL:"),
-    ],
-)
-def test_normalize_identifier_value_invalid_raises(scheme: str, value: str) -> None:
-    m = _m()
-    with pytest.raises(ValueError):
-        m._normalize_identifier_value(scheme, value)
+def test_normalize_identifier_value_invalid_raises() -> None:
+    failures = []
+    for scheme, value in _INVALID_CASES:
+        try:
+            got = m._normalize_identifier_value(scheme, value)
+        except ValueError:
+            continue
+        failures.append(f"{scheme}:{value!r} -> {got!r}, expected ValueError")
+    assert not failures, "\n".join(failures)
 
 
-@pytest.mark.parametrize(
-    "raw,expected",
-    [
-        ("sec", "sec_cik"),
-        ("CIK", "sec_cik"),
-        ("gleif", "gleif_lei"),
-        ("companies_house", "gb_companies_house"),
-        ("siren", "fr_siren"),
-        ("vat", "eu_vat"),
-        ("ticker", "ticker_exchange"),
-    ],
-)
-def test_scheme_alias(raw: str, expected: str) -> None:
-    m = _m()
-    assert m._scheme_alias(raw) == expected
+def test_scheme_alias() -> None:
+    failures = [
+        f"{raw!r} -> {got!r}, expected {expected!r}"
+        for raw, expected in _ALIAS_CASES
+        if (got := m._scheme_alias(raw)) != expected
+    ]
+    assert not failures, "\n".join(failures)
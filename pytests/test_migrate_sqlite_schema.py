@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from models.entity_metadata import EntityMetadata
+from pytests.common import create_empty_sqlite_db
+from pytests.sqlite_helpers import executescript
+from utils import migrate_sqlite_schema as m
+
+
+def _tables(db_path) -> set[str]:
+    con = sqlite3.connect(db_path)
+    try:
+        rows = con.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        return {r[0] for r in rows}
+    finally:
+        con.close()
+
+
+@pytest.fixture()
+def model_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "sec.db"
+    session, engine = create_empty_sqlite_db(db_path)
+    session.close()
+    engine.dispose()
+    # The test engine enables WAL; start from a plain rollback-journal DB instead.
+    con = sqlite3.connect(db_path)
+    try:
+        con.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        con.close()
+    monkeypatch.setattr(m, "DB_PATH", str(db_path))
+    return db_path
+
+
+def test_main_is_idempotent_on_model_schema(model_db, capsys):
+    m.main()
+    capsys.readouterr()
+
+    m.main()
+    assert "No changes needed" in capsys.readouterr().out
+
+
+def test_migrate_accepts_an_open_connection(model_db):
+    con = sqlite3.connect(model_db, isolation_level=None)
+    try:
+        # The model schema lacks the migration-only ix_entities_cik index.
+        assert m.migrate(con) is True
+        assert m.migrate(con) is False
+        assert not con.in_transaction
+    finally:
+        con.close()
+
+
+def _user_version(db_path) -> int:
+    con = sqlite3.connect(db_path)
+    try:
+        return con.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        con.close()
+
+
+def test_main_stamps_user_version_and_skips_current_db(model_db, monkeypatch, capsys):
+    m.main()
+    assert _user_version(model_db) == m.SCHEMA_VERSION
+    capsys.readouterr()
+
+    def _fail(cur):
+        raise AssertionError("schema introspected on an up-to-date DB")
+
+    monkeypatch.setattr(m, "load_schema_names", _fail)
+    m.main()
+    assert "No changes needed" in capsys.readouterr().out
+
+
+def test_main_rolls_back_everything_on_failure(tmp_path, monkeypatch):
+    # No entity_identifiers table: the column migrations fail after the new tables
+    # have been created, and none of that work may be left behind.
+    db_path = tmp_path / "partial.db"
+    executescript(db_path, "CREATE TABLE entities (id INTEGER PRIMARY KEY, cik TEXT);")
+    monkeypatch.setattr(m, "DB_PATH", str(db_path))
+
+    with pytest.raises(sqlite3.OperationalError):
+        m.main()
+
+    assert _tables(db_path) == {"entities"}
+    assert _user_version(db_path) == 0
+
+
+def test_main_switches_db_to_wal(model_db):
+    m.main()
+
+    con = sqlite3.connect(model_db)
+    try:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        con.close()
+
+
+def test_schema_additions_match_entity_metadata_model():
+    model_cols = set(EntityMetadata.__table__.columns.keys())
+    spec_cols = {col for col, _ddl in m.SCHEMA_ADDITIONS["entity_metadata"]}
+    assert spec_cols <= model_cols
+
+
+def test_table_creators_use_preloaded_schema_names(tmp_path):
+    con = sqlite3.connect(tmp_path / "names.db")
+    try:
+        cur = con.cursor()
+        existing = m.load_schema_names(cur)
+        assert existing == set()
+
+        statements: list[str] = []
+        con.set_trace_callback(statements.append)
+        assert m.create_sec_tickers_table_if_missing(cur, existing=existing) is True
+        assert m.create_sec_tickers_table_if_missing(cur, existing=existing) is False
+        con.set_trace_callback(None)
+
+        assert not [s for s in statements if "sqlite_master" in s]
+        assert ("table", "sec_tickers") in existing
+        assert ("index", "ix_sec_tickers_entity_id") in existing
+        assert existing <= m.load_schema_names(cur)
+    finally:
+        con.close()
+
+
+def test_main_replaces_indexes_covered_by_unique_constraints(model_db):
+    executescript(
+        model_db,
+        """
+        CREATE INDEX ix_daily_values_entity_id ON daily_values(entity_id);
+        CREATE INDEX ix_entity_relationships_parent_entity_id
+            ON entity_relationships(parent_entity_id);
+        CREATE INDEX ix_sec_filings_entity_id ON sec_filings(entity_id);
+        CREATE INDEX ix_sec_tickers_ticker ON sec_tickers(ticker);
+        """,
+    )
+
+    m.main()
+
+    con = sqlite3.connect(model_db)
+    try:
+        names = {r[0] for r in con.execute("SELECT name FROM sqlite_master")}
+    finally:
+        con.close()
+    assert "ix_daily_values_entity_id" not in names
+    assert "ix_entity_relationships_parent_entity_id" not in names
+    assert "ix_sec_filings_entity_id" not in names
+    assert "ix_sec_tickers_ticker" not in names
+    # uq_daily_values_entity_date_value already leads with (entity_id, date_id).
+    assert "ix_daily_values_entity_date" not in names
+
+
+def test_index_leads_with_ignores_partial_and_shorter_indexes(tmp_path):
+    con = sqlite3.connect(tmp_path / "idx.db")
+    try:
+        con.executescript(
+            """
+            CREATE TABLE t (a INTEGER, b INTEGER, c INTEGER);
+            CREATE INDEX ix_t_a ON t(a);
+            CREATE INDEX ix_t_ab_partial ON t(a, b) WHERE c = 1;
+            """
+        )
+        cur = con.cursor()
+        assert m.index_leads_with(cur, "t", ("a",))
+        assert not m.index_leads_with(cur, "t", ("a", "b"))
+
+        con.execute("CREATE UNIQUE INDEX ux_t_abc ON t(a, b, c)")
+        assert m.index_leads_with(cur, "t", ("a", "b"))
+    finally:
+        con.close()
+
+
+def test_set_migration_pragmas_disables_foreign_keys(tmp_path):
+    con = sqlite3.connect(tmp_path / "fk.db", isolation_level=None)
+    try:
+        con.execute("PRAGMA foreign_keys=ON")
+        m.set_migration_pragmas(con)
+        assert con.execute("PRAGMA foreign_keys").fetchone()[0] == 0
+    finally:
+        con.close()
+
+
+def test_main_analyzes_tables_that_gained_indexes(model_db):
+    executescript(
+        model_db,
+        """
+        DROP INDEX IF EXISTS ix_entities_cik;
+        INSERT INTO entities (cik, canonical_uuid)
+            VALUES ('0000000001', 'a'), ('0000000002', 'b');
+        """,
+    )
+
+    m.main()
+
+    con = sqlite3.connect(model_db)
+    try:
+        stats = con.execute("SELECT tbl, idx FROM sqlite_stat1").fetchall()
+    finally:
+        con.close()
+    assert ("entities", "ix_entities_cik") in stats
+
+
+def test_migrate_restores_foreign_keys_and_checks_touched_tables(
+    model_db, monkeypatch
+):
+    executescript(model_db, "ALTER TABLE file_processing DROP COLUMN record_count;")
+    checked: list[set[str]] = []
+    real_check = m.check_foreign_keys
+
+    def _record(cur, tables):
+        checked.append(set(tables))
+        real_check(cur, tables)
+
+    monkeypatch.setattr(m, "check_foreign_keys", _record)
+
+    con = sqlite3.connect(model_db, isolation_level=None)
+    try:
+        con.execute("PRAGMA foreign_keys=ON")
+        assert m.migrate(con) is True
+        assert con.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    finally:
+        con.close()
+    # entities also gains the legacy company_name/country/sector columns.
+    assert checked == [{"file_processing", "entities"}]
+
+
+def test_check_foreign_keys_raises_on_violation(tmp_path):
+    con = sqlite3.connect(tmp_path / "fkc.db")
+    try:
+        con.executescript(
+            """
+            CREATE TABLE parent (id INTEGER PRIMARY KEY);
+            CREATE TABLE child (id INTEGER PRIMARY KEY, parent_id REFERENCES parent);
+            INSERT INTO child (parent_id) VALUES (42);
+            """
+        )
+        with pytest.raises(sqlite3.IntegrityError, match="child"):
+            m.check_foreign_keys(con.cursor(), {"child"})
+        m.check_foreign_keys(con.cursor(), {"parent"})
+    finally:
+        con.close()
+
+
+def test_migrate_restores_connection_pragmas(model_db):
+    names = ("synchronous", "temp_store", "cache_size", "mmap_size", "foreign_keys")
+    con = sqlite3.connect(model_db, isolation_level=None)
+    try:
+        before = {name: con.execute(f"PRAGMA {name}").fetchone()[0] for name in names}
+        assert m.migrate(con) is True
+        after = {name: con.execute(f"PRAGMA {name}").fetchone()[0] for name in names}
+    finally:
+        con.close()
+    assert after == before
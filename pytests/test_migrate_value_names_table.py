@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+
+from pytests.sqlite_helpers import executescript
+from utils.migrate_value_names_table import migrate
+
+_LEGACY_DDL = """
+CREATE TABLE value_names (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+CREATE TABLE daily_values (
+    id INTEGER PRIMARY KEY,
+    value_name_id INTEGER NOT NULL REFERENCES value_names(id)
+);
+INSERT INTO value_names (id, name) VALUES (1, 'Revenue'), (2, 'Assets');
+"""
+
+
+def test_migrate_rebuilds_value_names_and_keeps_fk_target(tmp_path) -> None:
+    db_path = tmp_path / "vn.sqlite"
+    executescript(db_path, _LEGACY_DDL)
+
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as con:
+        assert migrate(con) is True
+
+        rows = con.execute(
+            "SELECT id, name, source, added_on IS NOT NULL FROM value_names ORDER BY id"
+        ).fetchall()
+        assert rows == [(1, "Revenue", 1, 1), (2, "Assets", 1, 1)]
+
+        names = {r[0] for r in con.execute("SELECT name FROM sqlite_master")}
+        assert "value_names_old" not in names
+        assert "ix_value_names_name" in names
+
+        # The RENAME must not have repointed the FK at the dropped value_names_old.
+        fks = con.execute("PRAGMA foreign_key_list(daily_values)").fetchall()
+        assert {r[2] for r in fks} == {"value_names"}
+
+
+def test_migrate_is_a_no_op_once_applied(tmp_path) -> None:
+    db_path = tmp_path / "vn.sqlite"
+    executescript(db_path, _LEGACY_DDL)
+
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as con:
+        assert migrate(con) is True
+        # Simulate a run that committed the copy but not the final DROP.
+        con.execute("CREATE TABLE value_names_old (id INTEGER PRIMARY KEY)")
+
+        assert migrate(con) is False
+        names = {r[0] for r in con.execute("SELECT name FROM sqlite_master")}
+        assert "value_names_old" not in names
+        assert con.execute("SELECT COUNT(*) FROM value_names").fetchone()[0] == 2
+
+
+def test_migrate_leaves_legacy_alter_table_off(tmp_path) -> None:
+    db_path = tmp_path / "vn.sqlite"
+    executescript(db_path, _LEGACY_DDL)
+
+    with closing(sqlite3.connect(db_path, isolation_level=None)) as con:
+        assert migrate(con) is True
+        assert con.execute("PRAGMA legacy_alter_table").fetchone()[0] == 0
+        assert migrate(con) is False
+        assert con.execute("PRAGMA legacy_alter_table").fetchone()[0] == 0
@@ -1,145 +1,101 @@
 from __future__ import annotations
 
-import sqlite3
-
+from pytests.sqlite_helpers import connect, executescript, table_columns_many
 from utils.migrate_sqlite_schema import migrate_multisource_schema_columns
 
-
-def _cols(cur: sqlite3.Cursor, table: str) -> set[str]:
-    cur.execute(f"PRAGMA table_info({table})")
-    return {row[1] for row in cur.fetchall()}
+_MIGRATED_TABLES = ("value_names", "daily_values", "entity_metadata")
+
+_BASE_DDL = """
+CREATE TABLE dates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL
+);
+CREATE TABLE daily_values (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_id INTEGER NOT NULL,
+    date_id INTEGER NOT NULL,
+    value_name_id INTEGER NOT NULL,
+    value TEXT
+);
+CREATE TABLE entity_metadata (
+    entity_id INTEGER PRIMARY KEY,
+    company_name TEXT NULL
+);
+"""
 
 
 def test_multisource_migrations_apply_to_empty_and_seeded_db(tmp_path) -> None:
     empty_db = tmp_path / "empty.sqlite"
 
     # Build a minimal "empty" DB: tables exist but without the new columns.
-    con = sqlite3.connect(empty_db)
+    executescript(
+        empty_db,
+        """
+        CREATE TABLE value_names (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL
+        );
+        """
+        + _BASE_DDL,
+    )
+
+    con = connect(empty_db)
     try:
         cur = con.cursor()
-        cur.execute(
-            """
-            CREATE TABLE value_names (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL
-            );
-            """.strip()
-        )
-        cur.execute(
-            """
-            CREATE TABLE dates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL
-            );
-            """.strip()
-        )
-        cur.execute(
-            """
-            CREATE TABLE daily_values (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entity_id INTEGER NOT NULL,
-                date_id INTEGER NOT NULL,
-                value_name_id INTEGER NOT NULL,
-                value TEXT
-            );
-            """.strip()
-        )
-        cur.execute(
-            """
-            CREATE TABLE entity_metadata (
-                entity_id INTEGER PRIMARY KEY,
-                company_name TEXT NULL
-            );
-            """.strip()
-        )
-        con.commit()
 
         changed = migrate_multisource_schema_columns(cur)
         assert changed is True
         con.commit()
 
-        assert {"namespace"}.issubset(_cols(cur, "value_names"))
+        cols = table_columns_many(cur, _MIGRATED_TABLES)
+        assert {"namespace"}.issubset(cols["value_names"])
         assert {"source", "period_type", "start_date_id", "accession_number"}.issubset(
-            _cols(cur, "daily_values")
-        )
-        assert {"data_sources", "last_sec_sync_at"}.issubset(
-            _cols(cur, "entity_metadata")
+            cols["daily_values"]
         )
+        assert {"data_sources", "last_sec_sync_at"}.issubset(cols["entity_metadata"])
 
         # Idempotent
         changed2 = migrate_multisource_schema_columns(cur)
         assert changed2 is False
+        assert table_columns_many(cur, _MIGRATED_TABLES) == cols
 
     finally:
         con.close()
 
     # Seeded DB case: same tables but with some pre-existing rows.
     seeded_db = tmp_path / "seeded.sqlite"
-    con2 = sqlite3.connect(seeded_db)
+    executescript(
+        seeded_db,
+        """
+        CREATE TABLE value_names (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            source TEXT NOT NULL DEFAULT 'sec'
+        );
+        """
+        + _BASE_DDL
+        + """
+        INSERT INTO value_names(name, source) VALUES('us-gaap.Assets','sec');
+        INSERT INTO dates(date) VALUES('2024-01-01');
+        INSERT INTO daily_values(entity_id, date_id, value_name_id, value) VALUES(1,1,1,'123');
+        INSERT INTO entity_metadata(entity_id, company_name) VALUES(1,'X');
+        """,
+    )
+
+    con2 = connect(seeded_db)
     try:
         cur2 = con2.cursor()
-        cur2.execute(
-            """
-            CREATE TABLE value_names (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                source TEXT NOT NULL DEFAULT 'sec'
-            );
-            """.strip()
-        )
-        cur2.execute(
-            "INSERT INTO value_names(name, source) VALUES('us-gaap.Assets','sec')"
-        )
-
-        cur2.execute(
-            """
-            CREATE TABLE dates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL
-            );
-            """.strip()
-        )
-        cur2.execute("INSERT INTO dates(date) VALUES('2024-01-01')")
-
-        cur2.execute(
-            """
-            CREATE TABLE daily_values (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entity_id INTEGER NOT NULL,
-                date_id INTEGER NOT NULL,
-                value_name_id INTEGER NOT NULL,
-                value TEXT
-            );
-            """.strip()
-        )
-        cur2.execute(
-            "INSERT INTO daily_values(entity_id, date_id, value_name_id, value) VALUES(1,1,1,'123')"
-        )
-
-        cur2.execute(
-            """
-            CREATE TABLE entity_metadata (
-                entity_id INTEGER PRIMARY KEY,
-                company_name TEXT NULL
-            );
-            """.strip()
-        )
-        cur2.execute(
-            "INSERT INTO entity_metadata(entity_id, company_name) VALUES(1,'X')"
-        )
-        con2.commit()
 
         changed_seeded = migrate_multisource_schema_columns(cur2)
         assert changed_seeded is True
         con2.commit()
 
-        assert {"namespace"}.issubset(_cols(cur2, "value_names"))
+        cols2 = table_columns_many(cur2, _MIGRATED_TABLES)
+        assert {"namespace"}.issubset(cols2["value_names"])
         assert {"source", "period_type", "start_date_id", "accession_number"}.issubset(
-            _cols(cur2, "daily_values")
-        )
-        assert {"data_sources", "last_sec_sync_at"}.issubset(
-            _cols(cur2, "entity_metadata")
+            cols2["daily_values"]
         )
+        assert {"data_sources", "last_sec_sync_at"}.issubset(cols2["entity_metadata"])
 
         # Existing row should still exist.
         cur2.execute("SELECT COUNT(*) FROM daily_values")
@@ -147,3 +103,43 @@ def test_multisource_migrations_apply_to_empty_and_seeded_db(tmp_path) -> None:
 
     finally:
         con2.close()
+
+
+def test_multisource_migrations_read_all_tables_columns_once(tmp_path) -> None:
+    db_path = tmp_path / "cached.sqlite"
+    executescript(
+        db_path,
+        """
+        CREATE TABLE value_names (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL
+        );
+        """
+        + _BASE_DDL,
+    )
+
+    con = connect(db_path)
+    try:
+        reads: list[str] = []
+
+        def _trace(sql: str) -> None:
+            # "-- PRAGMA ..." lines are traced for the table-valued function itself.
+            if "table_info" in sql and not sql.startswith("--"):
+                reads.append(sql)
+
+        con.set_trace_callback(_trace)
+        cur = con.cursor()
+        cache: dict[str, set[str]] = {}
+
+        assert migrate_multisource_schema_columns(cur, cache=cache) is True
+        assert migrate_multisource_schema_columns(cur, cache=cache) is False
+        con.set_trace_callback(None)
+
+        # One sqlite_master x pragma_table_info join covers every spec table.
+        assert len(reads) == 1, reads
+        # The cache tracks the columns it added, so it matches a fresh read.
+        assert {t: frozenset(c) for t, c in cache.items()} == table_columns_many(
+            cur, _MIGRATED_TABLES
+        )
+    finally:
+        con.close()
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-import importlib
-import json
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
+from sqlalchemy import func, select
 
 from models.daily_values import DailyValue
 from models.units import Unit
 from models.value_names import ValueName
-from pytests.common import create_empty_sqlite_db
+from pytests.common import create_empty_sqlite_db, load_fixture, patch_ingest_globals
+from utils import populate_daily_values as m
 
 
 @pytest.fixture()
@@ -22,45 +23,42 @@ def tmp_db_session(tmp_path):
         engine.dispose()
 
 
-@pytest.fixture()
+# Parsed once per session via `load_fixture`; the shallow `dict(...)` copy is what the
+# ingestion helpers' `isinstance(..., dict)` checks expect. No test mutates these.
+@pytest.fixture(scope="session")
 def sample_companyfacts_dict() -> dict:
-    p = Path(__file__).resolve().parents[1] / "test_data" / "companyfacts_sample.json"
-    return json.loads(p.read_text(encoding="utf-8"))
+    return dict(load_fixture("companyfacts_sample.json"))
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def sample_submissions_dict() -> dict:
-    p = Path(__file__).resolve().parents[1] / "test_data" / "submissions_sample.json"
-    return json.loads(p.read_text(encoding="utf-8"))
+    return dict(load_fixture("submissions_sample.json"))
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def sample_submissions_missing_dates_dict() -> dict:
-    p = (
-        Path(__file__).resolve().parents[1]
-        / "test_data"
-        / "submissions_missing_dates_sample.json"
-    )
-    return json.loads(p.read_text(encoding="utf-8"))
+    return dict(load_fixture("submissions_missing_dates_sample.json"))
 
 
-def _load_script_module():
-    # Import the script as a module so we can unit-test helpers.
-    return importlib.import_module("utils.populate_daily_values")
-
-
-def test_normalize_cik(sample_companyfacts_dict):
-    m = _load_script_module()
-    assert m._normalize_cik(1750) == "0000001750"
-    assert m._normalize_cik("0000000003") == "0000000003"
-    assert m._normalize_cik("CIK0000001750") == "0000001750"
-    assert m._normalize_cik(None) is None
+@pytest.mark.parametrize(
+    "inp,expected",
+    [
+        (1750, "0000001750"),
+        ("0000000003", "0000000003"),
+        ("CIK0000001750", "0000001750"),
+        (" 1750\n", "0000001750"),
+        ("CIK 0000-1750", "0000001750"),
+        ("n/a", None),
+        (None, None),
+    ],
+)
+def test_normalize_cik(inp, expected):
+    assert m._normalize_cik(inp) == expected
 
 
 def test_extract_entity_identity_prefers_payload_but_falls_back_to_filename(
     sample_companyfacts_dict,
 ):
-    m = _load_script_module()
     cik, name, metadata = m.extract_entity_identity(
         sample_companyfacts_dict, "CIK0000001750.json"
     )
@@ -77,13 +75,11 @@ def test_extract_entity_identity_prefers_payload_but_falls_back_to_filename(
 
 
 def test_iter_companyfacts_points(sample_companyfacts_dict):
-    m = _load_script_module()
     pts = list(m.iter_companyfacts_points(sample_companyfacts_dict["facts"]))
     assert ("us-gaap.Assets", "USD", "2010-05-31", 1501042000) in pts
 
 
 def test_resolve_recent_payload_and_iter_submissions_points(sample_submissions_dict):
-    m = _load_script_module()
     schema, recent = m._resolve_recent_payload(sample_submissions_dict)
     assert schema == "full_submissions"
     assert isinstance(recent, dict)
@@ -97,13 +93,10 @@ def test_process_companyfacts_file_inserts_daily_value(
     tmp_db_session, sample_companyfacts_dict, monkeypatch
 ):
     session, engine = tmp_db_session
-    m = _load_script_module()
 
-    # Patch the script's global session/engine to the temp test DB.
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "session", session, raising=False)
-    # Also patch Session to prevent _init_default_db_globals from recreating they objects.
-    monkeypatch.setattr(m, "Session", lambda: session, raising=False)
+    # Patch the script's global session/engine to the temp test DB. Also patch Session
+    # to prevent _init_default_db_globals from recreating those objects.
+    patch_ingest_globals(monkeypatch, m, engine=engine, session=session, Session=lambda: session)
 
     # Ensure NA unit exists and caches behave.
     unit_id = m.get_or_create_unit("NA").id
@@ -111,30 +104,17 @@ def test_process_companyfacts_file_inserts_daily_value(
     entity = m.get_or_create_entity("0000001750", company_name="AAR CORP.")
 
     # Minimal caches for processor
-    unit_cache = {}
-    value_name_cache = {}
-    date_cache = {}
-
+    @lru_cache(maxsize=None)
     def get_unit_id_cached(name):
-        key = (name or "NA").strip() or "NA"
-        if key in unit_cache:
-            return unit_cache[key]
-        unit_cache[key] = m.get_or_create_unit(key).id
-        return unit_cache[key]
+        return m.get_or_create_unit((name or "NA").strip() or "NA").id
 
+    @lru_cache(maxsize=None)
     def get_value_name_id_cached(name, unit_id):
-        key = (name, unit_id)
-        if key in value_name_cache:
-            return value_name_cache[key]
-        value_name_cache[key] = m.get_or_create_value_name(name, unit_id=unit_id).id
-        return value_name_cache[key]
+        return m.get_or_create_value_name(name, unit_id=unit_id).id
 
+    @lru_cache(maxsize=None)
     def get_date_id_cached(date_str):
-        if date_str in date_cache:
-            return date_cache[date_str]
-        de = m.get_or_create_date_entry(date_str)
-        date_cache[date_str] = de.id
-        return de.id
+        return m.get_or_create_date_entry(date_str).id
 
     planned, dups = m.process_companyfacts_file(
         data=sample_companyfacts_dict,
@@ -150,49 +130,75 @@ def test_process_companyfacts_file_inserts_daily_value(
 
     session.commit()
 
-    assert session.query(DailyValue).count() == 1
+    assert session.scalar(select(func.count(DailyValue.id))) == 1
+
+
+def test_preload_dimension_caches_matches_cached_getter_keys(tmp_db_session):
+    session, _engine = tmp_db_session
+    usd = m.get_or_create_unit("USD", session=session)
+    vn = m.get_or_create_value_name("Assets", unit_id=usd.id, session=session)
+    de = m.get_or_create_date_entry("2024-01-02", session=session)
+
+    unit_cache: dict[str, int] = {}
+    value_name_cache: dict[tuple[str, int | None], int] = {}
+    date_cache: dict[str, int] = {}
+    m._preload_dimension_caches(
+        session,
+        unit_cache=unit_cache,
+        value_name_cache=value_name_cache,
+        date_cache=date_cache,
+    )
+
+    assert unit_cache == {"USD": usd.id}
+    assert value_name_cache == {("Assets", usd.id): vn.id}
+    assert date_cache == {"2024-01-02": de.id}
+
+
+def test_insert_daily_value_ignore_skips_duplicates_without_flushing(
+    tmp_db_session, monkeypatch
+):
+    session, _engine = tmp_db_session
+    entity = m.get_or_create_entity(
+        "0000000014", company_name="SAMPLE", session=session
+    )
+    usd = m.get_or_create_unit("USD", session=session)
+    vn = m.get_or_create_value_name("Assets", unit_id=usd.id, session=session)
+    de = m.get_or_create_date_entry("2024-01-02", session=session)
+    session.flush()
+
+    def _no_flush(*_args, **_kwargs):
+        raise AssertionError("single-row insert should not flush the session")
+
+    monkeypatch.setattr(session, "flush", _no_flush)
+    args = (entity.id, de.id, vn.id, "1")
+    assert m._insert_daily_value_ignore(session, *args) is True
+    assert m._insert_daily_value_ignore(session, *args) is False
+    assert session.connection().scalar(select(func.count(DailyValue.id))) == 1
 
 
 def test_process_submissions_file_returns_unprocessed_reason_when_dates_missing(
     tmp_db_session, sample_submissions_missing_dates_dict, monkeypatch
 ):
     session, engine = tmp_db_session
-    m = _load_script_module()
 
     # Patch global session/engine to temp DB.
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "session", session, raising=False)
-    monkeypatch.setattr(m, "Session", lambda: session, raising=False)
+    patch_ingest_globals(monkeypatch, m, engine=engine, session=session, Session=lambda: session)
 
     entity = m.get_or_create_entity("0000000013", company_name="SAMPLE")
 
     # Minimal cache fns
-    unit_cache: dict[str, int] = {}
-    value_name_cache: dict[tuple[str, int | None], int] = {}
-    date_cache: dict[str, int] = {}
-
+    @lru_cache(maxsize=None)
     def get_unit_id_cached(unit_name: str | None) -> int:
-        key = (unit_name or "NA").strip() or "NA"
-        if key in unit_cache:
-            return unit_cache[key]
-        unit_cache[key] = m.get_or_create_unit(key).id
-        return unit_cache[key]
+        return m.get_or_create_unit((unit_name or "NA").strip() or "NA").id
 
+    @lru_cache(maxsize=None)
     def get_value_name_id_cached(name: str, unit_id: int | None) -> int:
-        key = (name, unit_id)
-        if key in value_name_cache:
-            return value_name_cache[key]
-        value_name_cache[key] = m.get_or_create_value_name(name, unit_id=unit_id).id
-        return value_name_cache[key]
+        return m.get_or_create_value_name(name, unit_id=unit_id).id
 
+    @lru_cache(maxsize=None)
     def get_date_id_cached(date_str: str) -> int | None:
-        if date_str in date_cache:
-            return date_cache[date_str]
         de = m.get_or_create_date_entry(date_str)
-        if not de:
-            return None
-        date_cache[date_str] = de.id
-        return de.id
+        return de.id if de else None
 
     schema, planned, dups, reason = m.process_submissions_file(
         data=sample_submissions_missing_dates_dict,
@@ -212,11 +218,8 @@ def test_process_submissions_file_returns_unprocessed_reason_when_dates_missing(
 
 def test_main_end_to_end_discovers_and_processes_two_files(tmp_db_session, monkeypatch):
     session, engine = tmp_db_session
-    m = _load_script_module()
 
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "session", session, raising=False)
-    monkeypatch.setattr(m, "Session", lambda: session, raising=False)
+    patch_ingest_globals(monkeypatch, m, engine=engine, session=session, Session=lambda: session)
 
     # Non-interactive in tests/CI.
     monkeypatch.setattr(m, "_prompt_yes_no", lambda *a, **k: True, raising=True)
@@ -240,6 +243,6 @@ def test_main_end_to_end_discovers_and_processes_two_files(tmp_db_session, monke
     m.main(["--db", db_path, "--workers", "1"])
 
     # Assets + submissions.recent.form + submissions.recent.accessionNumber + submissions.recent.primaryDocument
-    assert session.query(DailyValue).count() >= 2
-    assert session.query(ValueName).count() >= 2
-    assert session.query(Unit).count() >= 1
+    assert session.scalar(select(func.count(DailyValue.id))) >= 2
+    assert session.scalar(select(func.count(ValueName.id))) >= 2
+    assert session.scalar(select(func.count(Unit.id))) >= 1
@@ -1,17 +1,14 @@
 from __future__ import annotations
 
-import importlib
-import json
-from io import StringIO
-from pathlib import Path
-
 import pytest
+from sqlalchemy import func, select
 
 from models.dates import DateEntry
 from models.entities import Entity
 from models.units import Unit
 from models.value_names import ValueName
-from pytests.common import create_empty_sqlite_db
+from pytests.common import TEST_DATA_DIR, create_empty_sqlite_db, patch_ingest_globals
+from utils import populate_value_names as m
 
 
 @pytest.fixture()
@@ -24,42 +21,42 @@ def tmp_db_session(tmp_path):
         engine.dispose()
 
 
-@pytest.fixture()
-def sample_companyfacts_dict() -> dict:
-    p = Path(__file__).resolve().parents[1] / "test_data" / "companyfacts_sample.json"
-    return json.loads(p.read_text(encoding="utf-8"))
-
+@pytest.mark.parametrize(
+    "inp,expected",
+    [
+        (1750, "0000001750"),
+        ("0000000003", "0000000003"),
+        ("CIK0000001750", "0000001750"),
+        (None, None),
+    ],
+)
+def test_normalize_cik(inp, expected):
+    assert m._normalize_cik(inp) == expected
 
-@pytest.fixture()
-def sample_submissions_dict() -> dict:
-    p = Path(__file__).resolve().parents[1] / "test_data" / "submissions_sample.json"
-    return json.loads(p.read_text(encoding="utf-8"))
 
+@pytest.mark.parametrize(
+    "inp,expected",
+    [
+        ("2024-01-02", "2024-01-02"),
+        ("not-a-date", None),
+    ],
+)
+def test_parse_ymd(inp, expected):
+    d = m._parse_ymd(inp)
+    assert (str(d) if d is not None else None) == expected
 
-def _load_script_module():
-    # Import the script as a module so we can unit-test helpers.
-    return importlib.import_module("utils.populate_value_names")
 
+def test_iter_json_files_sorted_json_only_and_missing_dir(tmp_path):
+    for name in ("b.json", "a.JSON", "notes.txt"):
+        (tmp_path / name).write_text("{}")
 
-def test_normalize_cik():
-    m = _load_script_module()
-    assert m._normalize_cik(1750) == "0000001750"
-    assert m._normalize_cik("0000000003") == "0000000003"
-    assert m._normalize_cik("CIK0000001750") == "0000001750"
-    assert m._normalize_cik(None) is None
-
-
-def test_parse_ymd():
-    m = _load_script_module()
-    d = m._parse_ymd("2024-01-02")
-    assert d is not None
-    assert str(d) == "2024-01-02"
-    assert m._parse_ymd("not-a-date") is None
+    assert [fn for _path, fn in m._iter_json_files(str(tmp_path))] == ["a.JSON", "b.json"]
+    assert list(m._iter_json_files(str(tmp_path / "missing"))) == []
+    assert list(m._iter_json_files(str(tmp_path / "b.json"))) == []
 
 
 def test_get_or_create_helpers_are_idempotent(tmp_db_session):
     session, _engine = tmp_db_session
-    m = _load_script_module()
 
     e1 = m._get_or_create_entity(session, "0000001750", company_name="AAR CORP.")
     e2 = m._get_or_create_entity(session, "0000001750", company_name="AAR CORP.")
@@ -79,74 +76,45 @@ def test_get_or_create_helpers_are_idempotent(tmp_db_session):
 
 
 def test_process_submissions_inserts_entities_dates_units_and_value_names(
-    tmp_db_session, sample_submissions_dict, monkeypatch
+    tmp_db_session, monkeypatch
 ):
     session, engine = tmp_db_session
-    m = _load_script_module()
 
     # Direct the module to operate against the temp DB and temp raw_data.
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "Session", lambda **_: session, raising=False)
+    patch_ingest_globals(monkeypatch, m, engine=engine, Session=lambda **_: session)
 
-    # Provide exactly one submissions file via _iter_json_files.
+    # Provide exactly one submissions file via _iter_json_files; the script opens the
+    # real fixture file itself.
     def fake_iter_json_files(_dir: str):
-        yield "submissions_sample.json", "submissions_sample.json"
+        yield str(TEST_DATA_DIR / "submissions_sample.json"), "submissions_sample.json"
 
     monkeypatch.setattr(m, "_iter_json_files", fake_iter_json_files, raising=True)
 
-    def fake_open(_path: str, *args, **kwargs):
-        class _CM:
-            def __enter__(self):
-                # json.load expects a file-like object; we fake it by returning a
-                # minimal object with read().
-                return StringIO(json.dumps(sample_submissions_dict))
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-        return _CM()
-
-    monkeypatch.setattr(m, "open", fake_open, raising=False)
-
     counts = m._process_submissions(session)
 
     assert counts["files"] == 1
-    assert session.query(Entity).count() >= 1
-    assert session.query(Unit).filter_by(name="NA").count() == 1
-    assert session.query(ValueName).count() >= 1
-    assert session.query(DateEntry).count() >= 1
+    assert session.scalar(select(func.count(Entity.id))) >= 1
+    assert session.scalar(select(func.count(Unit.id)).where(Unit.name == "NA")) == 1
+    assert session.scalar(select(func.count(ValueName.id))) >= 1
+    assert session.scalar(select(func.count(DateEntry.id))) >= 1
 
 
 def test_process_companyfacts_inserts_units_value_names_and_dates(
-    tmp_db_session, sample_companyfacts_dict, monkeypatch
+    tmp_db_session, monkeypatch
 ):
     session, engine = tmp_db_session
-    m = _load_script_module()
 
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "Session", lambda **_: session, raising=False)
+    patch_ingest_globals(monkeypatch, m, engine=engine, Session=lambda **_: session)
 
     def fake_iter_json_files(_dir: str):
-        yield "companyfacts_sample.json", "companyfacts_sample.json"
+        yield str(TEST_DATA_DIR / "companyfacts_sample.json"), "companyfacts_sample.json"
 
     monkeypatch.setattr(m, "_iter_json_files", fake_iter_json_files, raising=True)
 
-    def fake_open(_path: str, *args, **kwargs):
-        class _CM:
-            def __enter__(self):
-                return StringIO(json.dumps(sample_companyfacts_dict))
-
-            def __exit__(self, exc_type, exc, tb):
-                return False
-
-        return _CM()
-
-    monkeypatch.setattr(m, "open", fake_open, raising=False)
-
     counts = m._process_companyfacts(session)
 
     assert counts["files"] == 1
     # companyfacts sample contains USD unit and at least one date/end.
-    assert session.query(Unit).count() >= 1
-    assert session.query(ValueName).count() >= 1
-    assert session.query(DateEntry).count() >= 1
+    assert session.scalar(select(func.count(Unit.id))) >= 1
+    assert session.scalar(select(func.count(ValueName.id))) >= 1
+    assert session.scalar(select(func.count(DateEntry.id))) >= 1
@@ -1,10 +1,7 @@
 from __future__ import annotations
 
-from app import create_app
 
-
-def test_home_page_renders_html():
-    app = create_app()
+def test_home_page_renders_html(app):
     client = app.test_client()
 
     resp = client.get("/")
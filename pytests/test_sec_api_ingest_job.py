@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from sqlalchemy import text
+
 from models.entities import Entity
 from models.sec_filings import SecFiling
 from pytests.common import create_empty_sqlite_db
@@ -68,3 +70,20 @@ def test_sec_api_ingest_updates_status_and_writes_file(tmp_path, monkeypatch):
     )
     assert out_path.exists()
     assert out_path.read_bytes() == b"<html>ok</html>"
+
+
+def test_pending_queue_query_uses_partial_index(tmp_path):
+    session, engine = create_empty_sqlite_db(tmp_path / "plan.sqlite")
+
+    import jobs.sec_api_ingest as job
+
+    stmt = (
+        session.query(SecFiling.id)
+        .filter(job._PENDING)
+        .order_by(SecFiling.id.asc())
+        .limit(10)
+        .statement
+    )
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    plan = session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    assert any("ix_sec_filings_pending" in row[-1] for row in plan), plan
@@ -1,73 +1,53 @@
 from __future__ import annotations
 
-from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
+import requests
 
 import utils.sec_edgar_api as api
 
 
-class _FakeResponse:
-    def __init__(
-        self, *, status_code: int, content: bytes = b"ok", headers: dict | None = None
-    ):
-        self.status_code = status_code
-        self.content = content
-        self.headers = headers or {}
+def _response(*, status_code: int, content: bytes = b"ok", headers: dict | None = None) -> Mock:
+    return Mock(status_code=status_code, content=content, headers=headers or {})
 
 
-class _FakeSession:
-    def __init__(self, responses):
-        self._responses = list(responses)
-        self.calls = []
+def _session(*responses) -> Mock:
+    """Fake `requests.Session` whose `get` returns/raises `responses` in order."""
 
-    def get(self, url, headers=None, timeout=None):
-        self.calls.append({"url": url, "headers": headers or {}, "timeout": timeout})
-        if not self._responses:
-            raise RuntimeError("No more fake responses")
-        r = self._responses.pop(0)
-        if isinstance(r, Exception):
-            raise r
-        return r
-
-
-class _FakeLimiter:
-    def __init__(self):
-        self.acquires = 0
-
-    def acquire(self):
-        self.acquires += 1
+    s = Mock(spec=requests.Session)
+    s.get = Mock(side_effect=list(responses))
+    return s
 
 
 def test_user_agent_is_always_present(monkeypatch):
     monkeypatch.setitem(api.SETTINGS, "SEC_USER_AGENT", "UnitTest UA test@example.com")
 
-    s = _FakeSession(
-        [
-            _FakeResponse(
-                status_code=200,
-                content=b"{}",
-                headers={"Content-Type": "application/json"},
-            )
-        ]
+    s = _session(
+        _response(
+            status_code=200,
+            content=b"{}",
+            headers={"Content-Type": "application/json"},
+        )
     )
-    limiter = _FakeLimiter()
+    limiter = Mock()
 
     api._request(url="https://example.test/", session=s, rate_limiter=limiter)
 
-    assert s.calls
-    assert "User-Agent" in s.calls[0]["headers"]
-    assert "UnitTest UA" in s.calls[0]["headers"]["User-Agent"]
+    assert s.get.called
+    headers = s.get.call_args_list[0].kwargs["headers"]
+    assert "User-Agent" in headers
+    assert "UnitTest UA" in headers["User-Agent"]
 
 
 def test_rate_limiter_invoked(monkeypatch):
     monkeypatch.setitem(api.SETTINGS, "SEC_USER_AGENT", "UnitTest UA test@example.com")
 
-    s = _FakeSession([_FakeResponse(status_code=200, content=b"ok")])
-    limiter = _FakeLimiter()
+    s = _session(_response(status_code=200, content=b"ok"))
+    limiter = Mock()
 
     api._request(url="https://example.test/", session=s, rate_limiter=limiter)
-    assert limiter.acquires == 1
+    assert limiter.acquire.call_count == 1
 
 
 @pytest.mark.parametrize("status_code", [429, 500, 502, 503, 504])
@@ -75,15 +55,11 @@ def test_retry_on_retryable_status_codes(monkeypatch, status_code):
     monkeypatch.setitem(api.SETTINGS, "SEC_USER_AGENT", "UnitTest UA test@example.com")
 
     # first attempt retryable, second attempt success
-    s = _FakeSession(
-        [
-            _FakeResponse(
-                status_code=status_code, content=b"nope", headers={"Retry-After": "0"}
-            ),
-            _FakeResponse(status_code=200, content=b"ok"),
-        ]
+    s = _session(
+        _response(status_code=status_code, content=b"nope", headers={"Retry-After": "0"}),
+        _response(status_code=200, content=b"ok"),
     )
-    limiter = _FakeLimiter()
+    limiter = Mock()
 
     # Avoid real sleeping
     monkeypatch.setattr(api.time, "sleep", lambda _x: None)
@@ -92,15 +68,15 @@ def test_retry_on_retryable_status_codes(monkeypatch, status_code):
         url="https://example.test/", session=s, rate_limiter=limiter, max_attempts=3
     )
     assert r.status_code == 200
-    assert len(s.calls) == 2
-    assert limiter.acquires == 2
+    assert s.get.call_count == 2
+    assert limiter.acquire.call_count == 2
 
 
 def test_non_retryable_status_raises(monkeypatch):
     monkeypatch.setitem(api.SETTINGS, "SEC_USER_AGENT", "UnitTest UA test@example.com")
 
-    s = _FakeSession([_FakeResponse(status_code=403, content=b"no")])
-    limiter = _FakeLimiter()
+    s = _session(_response(status_code=403, content=b"no"))
+    limiter = Mock()
 
     with pytest.raises(api.SecEdgarApiError):
         api._request(
@@ -36,32 +36,44 @@ def test_sec_tables_exist_on_fresh_db(tmp_path):
         engine.dispose()
 
 
-def test_sec_tables_created_by_migration_helpers(tmp_path):
-    # Create empty db file with just the core entities table.
-    db_path = tmp_path / "migrate.sqlite"
-    con = sqlite3.connect(str(db_path))
+@pytest.fixture(scope="module")
+def _memory_con() -> sqlite3.Connection:
+    # Autocommit mode so SAVEPOINT/ROLLBACK TO are the only transaction control;
+    # foreign_keys can't be toggled inside a transaction, so set it once here.
+    con = sqlite3.connect(":memory:", isolation_level=None)
+    con.execute("PRAGMA foreign_keys=ON")
+    yield con
+    con.close()
+
+
+@pytest.fixture()
+def migration_con(_memory_con) -> sqlite3.Connection:
+    """In-memory DB with just the core entities table; DDL is rolled back after each test."""
+
+    _memory_con.execute("SAVEPOINT migration_test")
     try:
-        con.execute("PRAGMA foreign_keys=ON")
-        con.execute("CREATE TABLE entities (id INTEGER PRIMARY KEY AUTOINCREMENT)")
-        con.commit()
-
-        cur = con.cursor()
-        changed_1 = False
-        changed_1 |= create_sec_filings_table_if_missing(cur)
-        changed_1 |= create_sec_tickers_table_if_missing(cur)
-        con.commit()
-
-        assert changed_1 is True
-        assert "sec_filings" in _tables(con)
-        assert "sec_tickers" in _tables(con)
-
-        # Idempotent re-run.
-        changed_2 = False
-        changed_2 |= create_sec_filings_table_if_missing(cur)
-        changed_2 |= create_sec_tickers_table_if_missing(cur)
-        assert changed_2 is False
+        _memory_con.execute("CREATE TABLE entities (id INTEGER PRIMARY KEY AUTOINCREMENT)")
+        yield _memory_con
     finally:
-        con.close()
+        _memory_con.execute("ROLLBACK TO migration_test")
+        _memory_con.execute("RELEASE migration_test")
+
+
+def test_sec_tables_created_by_migration_helpers(migration_con):
+    cur = migration_con.cursor()
+    changed_1 = False
+    changed_1 |= create_sec_filings_table_if_missing(cur)
+    changed_1 |= create_sec_tickers_table_if_missing(cur)
+
+    assert changed_1 is True
+    assert "sec_filings" in _tables(migration_con)
+    assert "sec_tickers" in _tables(migration_con)
+
+    # Idempotent re-run.
+    changed_2 = False
+    changed_2 |= create_sec_filings_table_if_missing(cur)
+    changed_2 |= create_sec_tickers_table_if_missing(cur)
+    assert changed_2 is False
 
 
 def test_sec_filings_insert_and_unique_constraint(tmp_path):
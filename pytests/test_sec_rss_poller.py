@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from sqlalchemy import func, select
+
 from models.entities import Entity
 from models.entity_identifiers import EntityIdentifier
 from models.sec_filings import SecFiling
@@ -53,3 +55,59 @@ def test_sec_rss_poller_upserts_pending_and_skips_unknown_cik(tmp_path, monkeypa
         session=session, url="http://example.test/atom", limit=50
     )
     assert summary2["inserted"] == 0
+
+
+def test_sec_rss_poller_skips_accession_repeated_in_feed(tmp_path, monkeypatch):
+    session, _engine = create_empty_sqlite_db(tmp_path / "rss_dupes.sqlite")
+
+    import jobs.sec_rss_poller as poller
+
+    e = Entity(cik="0000320193")
+    session.add(e)
+    session.flush()
+    session.add(EntityIdentifier(entity_id=e.id, scheme="sec_cik", value="0000320193"))
+    session.commit()
+
+    entry = """
+          <entry>
+            <title>8-K - Apple Inc (CIK=0000320193) (0000320193-24-000001)</title>
+            <link href='https://www.sec.gov/Archives/edgar/data/320193/000032019324000001/0000320193-24-000001-index.htm'/>
+          </entry>"""
+    atom = (
+        "<?xml version='1.0' encoding='UTF-8'?>"
+        f"<feed xmlns='http://www.w3.org/2005/Atom'>{entry}{entry}</feed>"
+    ).encode("utf-8")
+    monkeypatch.setattr(poller, "fetch_rss_feed", lambda url=None: atom)
+
+    summary = poller.run_poll(session=session, url="http://example.test/atom", limit=50)
+    assert summary["inserted"] == 1
+    assert session.scalar(select(func.count(SecFiling.id))) == 1
+
+
+def test_parse_atom_entries_extracts_fields_from_title_and_link():
+    import jobs.sec_rss_poller as poller
+
+    atom = b"""<feed xmlns='http://www.w3.org/2005/Atom'>
+      <entry>
+        <title>10-K - Example (cik=12345) (0000012345-24-000007)</title>
+      </entry>
+      <entry>
+        <title>S-1 - No CIK in title</title>
+        <link href='https://www.sec.gov/Archives/edgar/data/678/000067824000001/x-index.htm'/>
+      </entry>
+    </feed>"""
+
+    assert poller.parse_atom_entries(atom) == [
+        {
+            "cik": "0000012345",
+            "accession_number": "000001234524000007",
+            "form_type": "10-K",
+            "link": None,
+        },
+        {
+            "cik": "0000000678",
+            "accession_number": None,
+            "form_type": "S-1",
+            "link": "https://www.sec.gov/Archives/edgar/data/678/000067824000001/x-index.htm",
+        },
+    ]
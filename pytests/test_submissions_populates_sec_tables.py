@@ -1,37 +1,26 @@
 from __future__ import annotations
 
-import importlib
-import json
-from pathlib import Path
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
 
 from models.entities import Entity
 from models.entity_identifiers import EntityIdentifier
 from models.sec_filings import SecFiling
 from models.sec_tickers import SecTicker
-from pytests.common import create_empty_sqlite_db
-
-
-def _load_script_module():
-    return importlib.import_module("utils.populate_daily_values")
-
-
-def _load_fixture(name: str) -> dict:
-    p = Path(__file__).resolve().parents[1] / "test_data" / name
-    return json.loads(p.read_text(encoding="utf-8"))
+from pytests.common import create_empty_sqlite_db, load_fixture, patch_ingest_globals
+from utils import populate_daily_values as m
 
 
 def test_process_submissions_file_populates_sec_filings_and_is_idempotent(
     tmp_path, monkeypatch
 ):
     session, engine = create_empty_sqlite_db(tmp_path / "sec_struct.sqlite")
-    m = _load_script_module()
 
     # Patch script globals to the temp test DB.
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "session", session, raising=False)
-    monkeypatch.setattr(m, "Session", lambda: session, raising=False)
+    patch_ingest_globals(monkeypatch, m, engine=engine, session=session, Session=lambda: session)
 
-    data = _load_fixture("submissions_sample.json")
+    data = dict(load_fixture("submissions_sample.json"))
 
     # Create entity and ensure submissions processing has an entity_id.
     entity = Entity(cik="0000000003")
@@ -80,7 +69,7 @@ def test_process_submissions_file_populates_sec_filings_and_is_idempotent(
     assert schema == "full_submissions"
     assert reason is None
 
-    assert session.query(SecFiling).count() == 1
+    assert session.scalar(select(func.count(SecFiling.id))) == 1
     filing = session.query(SecFiling).first()
     assert filing is not None
     assert filing.entity_id == entity.id
@@ -101,18 +90,82 @@ def test_process_submissions_file_populates_sec_filings_and_is_idempotent(
     )
     assert schema2 == "full_submissions"
     assert reason2 is None
-    assert session.query(SecFiling).count() == 1
+    assert session.scalar(select(func.count(SecFiling.id))) == 1
+
+
+def test_submission_filings_existence_lookup_spans_batches(db_session, monkeypatch):
+    session = db_session
+    monkeypatch.setattr(m, "SQLITE_IN_CLAUSE_BATCH_SIZE", 2)
+
+    entity = Entity(cik="0000000003")
+    session.add(entity)
+    session.flush()
+
+    accessions = [f"0000000003-24-00000{i}" for i in range(5)]
+    data = {
+        "cik": "3",
+        "filings": {
+            "recent": {
+                "accessionNumber": accessions,
+                "form": ["10-K"] * len(accessions),
+                "filingDate": ["2024-01-02"] * len(accessions),
+            }
+        },
+    }
+
+    assert m._process_submission_filings(data, entity, session) == (5, 0)
+    assert m._process_submission_filings(data, entity, session) == (0, 0)
+
+    data["filings"]["recent"]["form"] = ["10-K/A"] * len(accessions)
+    assert m._process_submission_filings(data, entity, session) == (0, 5)
+    assert session.scalar(select(func.count(SecFiling.id))) == 5
+
+
+def test_submission_filings_insert_is_one_executemany_per_batch(
+    db_connection, db_session, monkeypatch
+):
+    session = db_session
+    monkeypatch.setattr(m, "EXECUTEMANY_BATCH_SIZE", 200)
+
+    entity = Entity(cik="0000000003")
+    session.add(entity)
+    session.flush()
+
+    accessions = [f"0000000003-24-{i:06d}" for i in range(500)]
+    data = {
+        "cik": "3",
+        "filings": {
+            "recent": {
+                "accessionNumber": accessions,
+                "form": ["10-K"] * len(accessions),
+                "filingDate": ["2024-01-02"] * len(accessions),
+            }
+        },
+    }
+
+    inserts: list[bool] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT") and "sec_filings" in statement:
+            inserts.append(executemany)
+
+    event.listen(db_connection, "before_cursor_execute", _record)
+    try:
+        assert m._process_submission_filings(data, entity, session) == (500, 0)
+    finally:
+        event.remove(db_connection, "before_cursor_execute", _record)
+
+    # 500 rows at 200 per batch: three executemany() round trips, not 500 INSERTs.
+    assert inserts == [True, True, True]
+    assert session.scalar(select(func.count(SecFiling.id))) == 500
 
 
 def test_process_submissions_file_populates_sec_tickers_and_entity_identifiers(
     tmp_path, monkeypatch
 ):
     session, engine = create_empty_sqlite_db(tmp_path / "sec_tickers.sqlite")
-    m = _load_script_module()
 
-    monkeypatch.setattr(m, "engine", engine, raising=False)
-    monkeypatch.setattr(m, "session", session, raising=False)
-    monkeypatch.setattr(m, "Session", lambda: session, raising=False)
+    patch_ingest_globals(monkeypatch, m, engine=engine, session=session, Session=lambda: session)
 
     # Minimal payload with tickers+exchanges.
     data = {
@@ -155,7 +208,7 @@ def test_process_submissions_file_populates_sec_tickers_and_entity_identifiers(
         session=session,
     )
 
-    assert session.query(SecTicker).count() == 1
+    assert session.scalar(select(func.count(SecTicker.id))) == 1
     t = session.query(SecTicker).first()
     assert t is not None
     assert t.ticker == "AAPL"
@@ -169,3 +222,38 @@ def test_process_submissions_file_populates_sec_tickers_and_entity_identifiers(
     )
     assert ident is not None
     assert ident.entity_id == entity.id
+
+
+def test_submission_tickers_rerun_inserts_nothing(db_session):
+    session = db_session
+
+    entity = Entity(cik="0000000003")
+    session.add(entity)
+    session.flush()
+
+    # A NULL exchange isn't deduplicated by the UNIQUE constraint in SQLite, so the
+    # pre-loaded lookup is what keeps reruns idempotent.
+    data = {"tickers": ["aapl", "AAPL", "brk"], "exchanges": ["XNAS", "XNAS"]}
+
+    assert m._process_submission_tickers(data, entity, session)[:2] == (2, 2)
+    assert m._process_submission_tickers(data, entity, session)[:2] == (0, 2)
+    assert session.scalar(select(func.count(SecTicker.id))) == 2
+    assert session.scalars(select(EntityIdentifier.value)).all() == ["AAPL:XNAS"]
+
+
+def test_submission_tickers_identifier_conflict_raises(db_session):
+    session = db_session
+
+    owner = Entity(cik="0000000001")
+    other = Entity(cik="0000000002")
+    session.add_all([owner, other])
+    session.flush()
+    session.add(
+        EntityIdentifier(entity_id=owner.id, scheme="ticker_exchange", value="AAPL:XNAS")
+    )
+    session.flush()
+
+    with pytest.raises(IntegrityError):
+        m._process_submission_tickers(
+            {"tickers": ["AAPL"], "exchanges": ["XNAS"]}, other, session
+        )
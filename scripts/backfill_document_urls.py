@@ -10,34 +10,74 @@ This allows previously failed filings to be retried with --retry-failed.
 """
 from __future__ import annotations
 
+import re
+import sqlite3
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 _PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
-from db import SessionLocal
+import db
 from models.sec_filings import SecFiling
 from logging_utils import get_logger
-from sqlalchemy import or_
+from sqlalchemy import bindparam, func, or_, select
 
 logger = get_logger(__name__)
 
+_EDGAR_DATA_PREFIX = "https://www.sec.gov/Archives/edgar/data/"
+
+# CIK path segment of an EDGAR archive URL (".../data/{cik}/..." or ".../data/{cik}").
+_ARCHIVE_CIK_RE = re.compile(r"/Archives/edgar/data/(\d+)(?:/|$)", re.ASCII)
+
+# Rows per UPDATE flush, and per page when scanning candidates.
+UPDATE_BATCH_SIZE = 1000
+
+_sec_filings = SecFiling.__table__
+_UPDATE_DOCUMENT_URL = (
+    _sec_filings.update()
+    .where(_sec_filings.c.id == bindparam("b_id"))
+    .values(document_url=bindparam("b_url"))
+)
+
+# UPDATE ... FROM needs SQLite 3.33+. Two bound parameters per row, so 499 rows
+# stay under the 999-variable limit of older builds.
+_SQLITE_HAS_UPDATE_FROM = sqlite3.sqlite_version_info >= (3, 33, 0)
+_VALUES_ROWS_PER_STATEMENT = 499
+
+
+@lru_cache(maxsize=4)
+def _update_from_values_sql(n_rows: int) -> str:
+    values = ", ".join(["(?, ?)"] * n_rows)
+    return (
+        f"UPDATE {_sec_filings.name} SET document_url = v.column2 "
+        f"FROM (VALUES {values}) AS v WHERE {_sec_filings.name}.id = v.column1"
+    )
+
+
+def _apply_updates(conn, pending: list[dict]) -> None:
+    """Write `pending` document_url updates.
+
+    On SQLite with UPDATE ... FROM support each chunk is a single statement joined
+    against a VALUES list; other dialects/older SQLite use executemany().
+    """
+    if conn.dialect.name != "sqlite" or not _SQLITE_HAS_UPDATE_FROM:
+        conn.execute(_UPDATE_DOCUMENT_URL, pending)
+        return
+    for start in range(0, len(pending), _VALUES_ROWS_PER_STATEMENT):
+        chunk = pending[start : start + _VALUES_ROWS_PER_STATEMENT]
+        params = tuple(v for row in chunk for v in (row["b_id"], row["b_url"]))
+        conn.exec_driver_sql(_update_from_values_sql(len(chunk)), params)
+
 
 def _infer_cik_from_url(url: str | None) -> str | None:
     """Extract CIK from SEC archive URL."""
     if not url:
         return None
-    s = str(url)
-    marker = "/Archives/edgar/data/"
-    if marker not in s:
-        return None
-    tail = s.split(marker, 1)[1]
-    parts = tail.split("/")
-    if parts and parts[0].isdigit():
-        return parts[0]
-    return None
+    match = _ARCHIVE_CIK_RE.search(str(url))
+    return match.group(1) if match else None
 
 
 def _normalize_accession(accession: str) -> str:
@@ -45,6 +85,34 @@ def _normalize_accession(accession: str) -> str:
     return str(accession).strip().replace("-", "")
 
 
+def _iter_candidates(conn, criteria):
+    """Yield (id, index_url, full_text_url, accession_number, form_type) rows by id.
+
+    Pages of `UPDATE_BATCH_SIZE` rows are fetched with keyset pagination rather than
+    one open cursor, because batched UPDATEs run on the same connection mid-scan
+    and SQLite leaves revisiting modified rows of a live SELECT undefined.
+    """
+    stmt = (
+        select(
+            SecFiling.id,
+            SecFiling.index_url,
+            SecFiling.full_text_url,
+            SecFiling.accession_number,
+            SecFiling.form_type,
+        )
+        .where(*criteria)
+        .order_by(SecFiling.id)
+        .limit(UPDATE_BATCH_SIZE)
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(stmt.where(SecFiling.id > last_id)).all()
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1].id
+
+
 def backfill_document_urls(*, dry_run: bool = False) -> dict[str, int]:
     """
     Backfill missing document_url fields.
@@ -55,26 +123,30 @@ def backfill_document_urls(*, dry_run: bool = False) -> dict[str, int]:
     Returns:
         Summary counts.
     """
-    with SessionLocal() as session:
+    # Core connection, no Session: every statement here is a plain select/update,
+    # so there is no identity map or autoflush to maintain. Commits on exit.
+    with db.engine.begin() as conn:
         # Find filings with missing document_url but have index_url or full_text_url
-        q = (
-            session.query(SecFiling)
-            .filter(or_(SecFiling.document_url == None, SecFiling.document_url == ""))
-            .filter(or_(SecFiling.index_url != None, SecFiling.full_text_url != None))
+        criteria = (
+            or_(SecFiling.document_url == None, SecFiling.document_url == ""),
+            or_(SecFiling.index_url != None, SecFiling.full_text_url != None),
         )
 
-        filings = q.all()
+        found = conn.scalar(
+            select(func.count()).select_from(SecFiling).where(*criteria)
+        )
 
-        if not filings:
+        if not found:
             logger.info("No filings found with missing document_url to backfill.")
             return {"found": 0, "updated": 0, "skipped": 0}
 
-        logger.info("Found %s filings with missing document_url", len(filings))
+        logger.info("Found %s filings with missing document_url", found)
 
         updated = 0
         skipped = 0
+        pending: list[dict] = []
 
-        for filing in filings:
+        for filing in _iter_candidates(conn, criteria):
             # Try to infer CIK from available URLs
             cik = None
             for url in (filing.index_url, filing.full_text_url):
@@ -102,7 +174,7 @@ def backfill_document_urls(*, dry_run: bool = False) -> dict[str, int]:
             # Construct document_url: typically the primary .txt file
             accession_normalized = _normalize_accession(filing.accession_number)
             document_url = (
-                f"https://www.sec.gov/Archives/edgar/data/{cik}/"
+                f"{_EDGAR_DATA_PREFIX}{cik}/"
                 f"{accession_normalized}/{filing.accession_number}.txt"
             )
 
@@ -115,7 +187,10 @@ def backfill_document_urls(*, dry_run: bool = False) -> dict[str, int]:
                     document_url,
                 )
             else:
-                filing.document_url = document_url
+                pending.append({"b_id": filing.id, "b_url": document_url})
+                if len(pending) >= UPDATE_BATCH_SIZE:
+                    _apply_updates(conn, pending)
+                    pending = []
                 logger.info(
                     "Updated | filing_id=%s accession=%s form_type=%s document_url=%s",
                     filing.id,
@@ -126,11 +201,13 @@ def backfill_document_urls(*, dry_run: bool = False) -> dict[str, int]:
 
             updated += 1
 
-        if not dry_run:
-            session.commit()
-            logger.info("Committed %s document_url updates", updated)
+        if pending:
+            _apply_updates(conn, pending)
+
+    if not dry_run:
+        logger.info("Committed %s document_url updates", updated)
 
-        return {"found": len(filings), "updated": updated, "skipped": skipped}
+    return {"found": found, "updated": updated, "skipped": skipped}
 
 
 def main() -> None:
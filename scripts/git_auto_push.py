@@ -10,17 +10,19 @@ Behavior:
 
 Aborts on any issue.
 
-Requires: GitPython (installed in this workspace).
+Requires: the `git` executable on PATH.
 """
 
 from __future__ import annotations
 
 import logging
-import os
+import subprocess
 import sys
 from pathlib import Path
 
-from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
+
+class GitCommandError(RuntimeError):
+    """A git invocation exited non-zero."""
 
 
 def _configure_logging(*, verbose: bool = False) -> logging.Logger:
@@ -36,9 +38,23 @@ def _repo_root_from_cwd() -> Path:
     return Path.cwd()
 
 
-def _assert_repo_safe_state(repo: Repo) -> None:
-    git_dir = Path(repo.git_dir)
+def _run_git(cwd: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=False
+    )
+
+
+def _git(cwd: Path, *args: str) -> str:
+    """Run `git <args>` in `cwd` and return stripped stdout; raise on failure."""
 
+    proc = _run_git(cwd, *args)
+    if proc.returncode != 0:
+        detail = (proc.stderr or proc.stdout).strip()
+        raise GitCommandError(f"git {' '.join(args)} failed: {detail}")
+    return proc.stdout.strip()
+
+
+def _assert_repo_safe_state(git_dir: Path) -> None:
     # Common in-progress operation indicators.
     blockers = {
         "MERGE_HEAD": "merge in progress",
@@ -54,23 +70,41 @@ def _assert_repo_safe_state(repo: Repo) -> None:
             raise RuntimeError(f"Refusing to continue: {desc} (found {p}).")
 
 
-def _require_origin_main(repo: Repo) -> None:
-    if "origin" not in [r.name for r in repo.remotes]:
+def _require_origin_main(root: Path) -> None:
+    if "origin" not in _git(root, "remote").splitlines():
         raise RuntimeError("Remote 'origin' does not exist.")
 
     # Warn/abort if current branch isn't main to prevent accidental pushes.
-    try:
-        branch = repo.active_branch.name
-    except TypeError:
+    proc = _run_git(root, "symbolic-ref", "--short", "-q", "HEAD")
+    if proc.returncode != 0:
         # Detached HEAD
         raise RuntimeError("Detached HEAD; refusing to push.")
 
+    branch = proc.stdout.strip()
     if branch != "main":
         raise RuntimeError(
             f"Current branch is '{branch}', expected 'main'. Refusing to push."
         )
 
 
+def _has_staged_changes(root: Path) -> bool:
+    """Return True if the index differs from HEAD; raise on git errors.
+
+    `git diff --cached --quiet` exits 1 when staged changes exist and 0 when there
+    are none (on an unborn branch it compares against the empty tree). Any other
+    exit code is a git failure, not "changes present".
+    """
+
+    args = ("diff", "--cached", "--quiet")
+    proc = _run_git(root, *args)
+    if proc.returncode == 1:
+        return True
+    if proc.returncode != 0:
+        detail = (proc.stderr or proc.stdout).strip()
+        raise GitCommandError(f"git {' '.join(args)} failed: {detail}")
+    return False
+
+
 def _prompt_commit_message() -> str:
     msg = input("Commit message: ").strip()
     if not msg:
@@ -84,33 +118,30 @@ def main(argv: list[str] | None = None) -> int:
 
     logger = _configure_logging(verbose=verbose)
 
+    cwd = _repo_root_from_cwd()
     try:
-        repo = Repo(_repo_root_from_cwd(), search_parent_directories=True)
-    except (InvalidGitRepositoryError, NoSuchPathError) as e:
+        root = Path(_git(cwd, "rev-parse", "--show-toplevel"))
+        git_dir = Path(_git(cwd, "rev-parse", "--absolute-git-dir"))
+    except (GitCommandError, OSError) as e:
         logger.error("Not a git repository: %s", e)
         return 2
 
     try:
-        _assert_repo_safe_state(repo)
-        _require_origin_main(repo)
+        _assert_repo_safe_state(git_dir)
+        _require_origin_main(root)
 
         # Step 1: status checks.
         # If there are untracked/modified changes, we can proceed, but if there is
         # nothing to commit we abort later.
-        is_dirty = repo.is_dirty(untracked_files=True)
-        logger.info("Repo root: %s", repo.working_tree_dir)
+        is_dirty = bool(_git(root, "status", "--porcelain"))
+        logger.info("Repo root: %s", root)
         logger.info("Working tree dirty: %s", is_dirty)
 
         # Step 2: stage changes (git add .)
         logger.info("Staging changes (git add .)")
-        repo.git.add(A=True)
+        _git(root, "add", "-A")
 
-        # Ensure there's something staged.
-        staged_diff = (
-            repo.index.diff("HEAD") if repo.head.is_valid() else repo.index.diff(None)
-        )
-        if not staged_diff and not repo.untracked_files:
-            # After staging, if nothing is different relative to HEAD, abort.
+        if not _has_staged_changes(root):
             logger.info("No changes to commit; aborting.")
             return 0
 
@@ -119,22 +150,16 @@ def main(argv: list[str] | None = None) -> int:
 
         # Step 4: commit
         logger.info("Creating commit")
-        repo.index.commit(msg)
+        _git(root, "commit", "-m", msg)
 
         # Step 5: push origin main
         logger.info("Pushing to origin main")
-        origin = repo.remotes.origin
-        results = origin.push(refspec="main:main")
-
-        # Detect push errors.
-        for r in results:
-            if r.flags & r.ERROR:
-                raise RuntimeError(getattr(r, "summary", None) or "Push failed")
+        _git(root, "push", "origin", "main:main")
 
         logger.info("Done")
         return 0
 
-    except (GitCommandError, RuntimeError) as e:
+    except RuntimeError as e:
         logger.error("Aborted: %s", e)
         return 1
     except KeyboardInterrupt:
@@ -16,17 +16,10 @@ SETTINGS: dict[str, object] = {
     # SEC EDGAR
     # SEC requires a descriptive User-Agent that includes contact info.
     # Example: "InvestorGuide your.name@domain.com"
+    # Prefer setting SEC_EDGAR_USER_AGENT (or this key) explicitly.
     "SEC_USER_AGENT": "InvestorGuide (set SETTINGS['SEC_USER_AGENT'] to your@email.com)",
 }
 
-# Provide a more descriptive default SEC User-Agent to reduce the chance of
-# 403 blocks during local/dev runs when the environment isn't configured.
-# Prefer setting SEC_EDGAR_USER_AGENT (or SETTINGS['SEC_USER_AGENT']) explicitly.
-SETTINGS.setdefault(
-    "SEC_USER_AGENT",
-    "sec_test/0.1 (local dev; contact: unset)",
-)
-
 # Optional convenience exports (mirrors earlier style).
 SECRET_KEY = SETTINGS["SECRET_KEY"]
 ENABLE_DB_CHECK = SETTINGS["ENABLE_DB_CHECK"]
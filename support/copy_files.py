@@ -7,6 +7,35 @@ from __future__ import annotations
 
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Copies are I/O-bound, so threads overlap the kernel-side work.
+COPY_WORKERS = 8
+
+
+def _copy_file(src_file: str, dst_file: str) -> None:
+    """Copy contents and metadata like `shutil.copy2`, in-kernel where possible.
+
+    On Linux `os.copy_file_range` lets the filesystem reflink (Btrfs/XFS) or copy
+    server-side; elsewhere, or if the call is unsupported, fall back to
+    `shutil.copyfile` (which already uses sendfile/fcopyfile when it can).
+    """
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src_file, "rb") as src, open(dst_file, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            copied = remaining == 0
+        except OSError:
+            copied = False
+    if not copied:
+        shutil.copyfile(src_file, dst_file)
+    shutil.copystat(src_file, dst_file)
 
 
 def main() -> None:
@@ -15,11 +44,16 @@ def main() -> None:
 
     os.makedirs(dst_dir, exist_ok=True)
 
-    for filename in os.listdir(src_dir):
-        src_file = os.path.join(src_dir, filename)
-        dst_file = os.path.join(dst_dir, filename)
-        if os.path.isfile(src_file):
-            shutil.copy2(src_file, dst_file)
+    with os.scandir(src_dir) as entries:
+        jobs = [
+            (entry.path, os.path.join(dst_dir, entry.name))
+            for entry in entries
+            if entry.is_file()
+        ]
+
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        # list() re-raises the first copy error, like the old sequential loop.
+        list(pool.map(lambda job: _copy_file(*job), jobs))
 
 
 if __name__ == "__main__":
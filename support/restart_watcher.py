@@ -9,6 +9,9 @@ Runs a tiny supervisor loop:
 - when the flag updates, restarts the subprocess
 
 This keeps the "restart" responsibility outside the Flask process.
+
+With `watchdog` installed (requirements-dev.txt) the loop sleeps until the flag
+changes or the app exits; otherwise it falls back to polling every 0.5s.
 """
 
 from __future__ import annotations
@@ -17,13 +20,53 @@ import os
 import signal
 import subprocess
 import sys
+import threading
 import time
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional: fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+POLL_INTERVAL_SECONDS = 0.5
+
 
 def _repo_root() -> str:
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
+class _FlagHandler(FileSystemEventHandler):
+    """Set `wake` on any event touching the restart flag (incl. atomic renames)."""
+
+    def __init__(self, restart_flag: str, wake: threading.Event) -> None:
+        super().__init__()
+        self._restart_flag = restart_flag
+        self._wake = wake
+
+    def on_any_event(self, event) -> None:
+        paths = (event.src_path, getattr(event, "dest_path", ""))
+        if self._restart_flag in paths:
+            self._wake.set()
+
+
+def _watch_flag(restart_flag: str, wake: threading.Event):
+    """Start a watchdog observer on the flag's directory; None without watchdog."""
+    if Observer is None:
+        return None
+    os.makedirs(os.path.dirname(restart_flag), exist_ok=True)
+    observer = Observer()
+    observer.schedule(
+        _FlagHandler(restart_flag, wake),
+        path=os.path.dirname(restart_flag),
+        recursive=False,
+    )
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
 def main() -> int:
     root = _repo_root()
     restart_flag = os.path.join(root, "tmp", "restart_requested")
@@ -33,10 +76,17 @@ def main() -> int:
 
     last_mtime = 0.0
     proc: subprocess.Popen | None = None
+    wake = threading.Event()
+    observer = _watch_flag(restart_flag, wake)
 
     def start_proc() -> subprocess.Popen:
         os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
-        return subprocess.Popen(cmd, cwd=root)
+        p = subprocess.Popen(cmd, cwd=root)
+        # Wake the loop when the app exits so it is restarted without polling.
+        threading.Thread(
+            target=lambda: (p.wait(), wake.set()), daemon=True
+        ).start()
+        return p
 
     def stop_proc(p: subprocess.Popen) -> None:
         if p.poll() is not None:
@@ -66,7 +116,11 @@ def main() -> int:
             stop_proc(proc)
             proc = start_proc()
 
-        time.sleep(0.5)
+        if observer is None:
+            time.sleep(POLL_INTERVAL_SECONDS)
+        else:
+            wake.wait()
+            wake.clear()
 
 
 if __name__ == "__main__":
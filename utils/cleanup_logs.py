@@ -19,7 +19,9 @@ import argparse
 import os
 import sys
 import time
+from collections import defaultdict
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 
 
@@ -27,32 +29,72 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 LOGS_DIR = PROJECT_ROOT / "logs"
 
 
-@dataclass(frozen=True)
+# slots: log dirs can hold 100k+ files, and a slotted instance is about half the
+# size of a dict-backed one.
+@dataclass(frozen=True, slots=True)
 class Candidate:
     path: Path
     mtime: float
     size: int
 
 
+_MTIME = attrgetter("mtime")
+_SIZE = attrgetter("size")
+
+
+def _iter_file_entries(dir_path: str):
+    """Yield an `os.DirEntry` for every file under `dir_path`, recursively.
+
+    DirEntry carries the file type from the directory listing, so no stat is
+    needed to tell files from directories. Like `rglob`, symlinked directories
+    are not descended into; unreadable directories are skipped.
+    """
+    try:
+        it = os.scandir(dir_path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_file_entries(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+
+
+def _walk_files(dir_path: str):
+    """Yield (path, mtime, size) for every file under `dir_path` (one stat each)."""
+    for entry in _iter_file_entries(dir_path):
+        try:
+            st = entry.stat()
+        except OSError:
+            continue  # vanished mid-walk
+        yield entry.path, st.st_mtime, st.st_size
+
+
 def _iter_log_files(logs_dir: Path) -> list[Candidate]:
     if not logs_dir.exists():
         return []
 
-    out: list[Candidate] = []
-    for p in logs_dir.rglob("*"):
-        if not p.is_file():
-            continue
-        try:
-            st = p.stat()
-        except OSError:
-            continue
-        out.append(Candidate(path=p, mtime=st.st_mtime, size=st.st_size))
+    out = [
+        Candidate(path=Path(path), mtime=mtime, size=size)
+        for path, mtime, size in _walk_files(str(logs_dir))
+    ]
 
     # newest first
-    out.sort(key=lambda c: c.mtime, reverse=True)
+    out.sort(key=_MTIME, reverse=True)
     return out
 
 
+def _display_path(path: Path) -> Path:
+    try:
+        return path.relative_to(PROJECT_ROOT)
+    except ValueError:
+        return path
+
+
 def _format_bytes(n: int) -> str:
     size = float(n)
     for unit in ("B", "KB", "MB", "GB", "TB"):
@@ -74,10 +116,7 @@ def _confirm_or_exit(logs_dir: Path, assume_yes: bool) -> bool:
     if not logs_dir.exists():
         return True
 
-    try:
-        file_count = sum(1 for p in logs_dir.rglob("*") if p.is_file())
-    except OSError:
-        file_count = 0
+    file_count = sum(1 for _ in _iter_file_entries(str(logs_dir)))
 
     resp = input(
         "\n\u26a0\ufe0f  WARNING: This will delete log files in:\n"
@@ -93,6 +132,73 @@ def _confirm_or_exit(logs_dir: Path, assume_yes: bool) -> bool:
     return True
 
 
+def _unlink_files(paths) -> tuple[int, int]:
+    """Delete `paths`, returning (deleted, errors); errors are reported and skipped.
+
+    Files are grouped by parent directory and unlinked relative to one open
+    directory fd per group, so the kernel resolves each parent path once rather
+    than once per file. Platforms without dir_fd support unlink by full path.
+    """
+    by_parent: defaultdict[str, list[str]] = defaultdict(list)
+    for p in paths:
+        parent, name = os.path.split(os.fspath(p))
+        by_parent[parent].append(name)
+
+    use_dir_fd = os.unlink in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+    deleted = 0
+    errors = 0
+    for parent, names in by_parent.items():
+        dir_fd = None
+        if use_dir_fd:
+            try:
+                dir_fd = os.open(parent, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                dir_fd = None  # fall back to full paths for this group
+        try:
+            for name in names:
+                try:
+                    if dir_fd is not None:
+                        os.unlink(name, dir_fd=dir_fd)
+                    else:
+                        os.unlink(os.path.join(parent, name))
+                    deleted += 1
+                except OSError as e:
+                    errors += 1
+                    print(
+                        f"Could not delete {os.path.join(parent, name)}: {e}",
+                        file=sys.stderr,
+                    )
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+    return deleted, errors
+
+
+def _purge_all(logs_dir: Path) -> int:
+    """Delete every file under `logs_dir` (the default --days 0 --keep 0 run).
+
+    With no retention rule to apply there is nothing to sort or size, so this
+    skips the Candidate list entirely. As with the `mtime < cutoff` rule, files
+    modified at or after the start of the run (e.g. a log still being written)
+    are kept.
+    """
+    now = time.time()
+    paths = [path for path, mtime, _size in _walk_files(str(logs_dir)) if mtime < now]
+    if not paths:
+        print(f"No files found in {logs_dir}")
+        return 0
+
+    print(f"Logs dir: {logs_dir}")
+    print(f"Will delete: all {len(paths)} files")
+
+    deleted, errors = _unlink_files(paths)
+
+    print(f"Deleted {deleted}/{len(paths)} files")
+    if errors:
+        print(f"Encountered {errors} errors while deleting files (continued).")
+    return 0 if deleted == len(paths) else 2
+
+
 def cleanup_logs(
     *,
     logs_dir: Path,
@@ -113,6 +219,9 @@ def cleanup_logs(
     count is <= max_total_files (after applying keep_newest protection).
     """
 
+    if max_age_days <= 0 and keep_newest <= 0 and max_total_files is None and not dry_run:
+        return _purge_all(logs_dir)
+
     files = _iter_log_files(logs_dir)
     if not files:
         print(f"No files found in {logs_dir}")
@@ -161,8 +270,8 @@ def cleanup_logs(
                 dedup_delete.append(c)
             delete = dedup_delete
 
-    total_size = sum(c.size for c in files)
-    delete_size = sum(c.size for c in delete)
+    total_size = sum(map(_SIZE, files))
+    delete_size = sum(map(_SIZE, delete))
 
     print(f"Logs dir: {logs_dir}")
     print(f"Total files: {len(files)} ({_format_bytes(total_size)})")
@@ -178,34 +287,19 @@ def cleanup_logs(
     print(f"Will delete: {len(delete)} files ({_format_bytes(delete_size)})")
 
     if dry_run:
+        # One write for the whole report: a large logs dir yields one line per file.
+        lines: list[str] = []
         for c in delete:
             age_days = (now - c.mtime) / 86400
-            try:
-                rel = c.path.relative_to(PROJECT_ROOT)
-            except Exception:
-                rel = c.path
-            print(f"DRY-RUN delete: {rel} (age {age_days:.1f}d)")
+            lines.append(f"DRY-RUN delete: {_display_path(c.path)} (age {age_days:.1f}d)")
         if keep_newest:
             for c in files[:keep_newest]:
-                try:
-                    rel = c.path.relative_to(PROJECT_ROOT)
-                except Exception:
-                    rel = c.path
-                print(f"DRY-RUN keep (protected): {rel}")
+                lines.append(f"DRY-RUN keep (protected): {_display_path(c.path)}")
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
         return 0
 
-    deleted = 0
-    errors = 0
-    for c in delete:
-        try:
-            c.path.unlink()
-            deleted += 1
-        except OSError as e:
-            errors += 1
-            print(f"Could not delete {c.path}: {e}", file=sys.stderr)
-        except Exception as e:
-            errors += 1
-            print(f"Unexpected error deleting {c.path}: {e}", file=sys.stderr)
+    deleted, errors = _unlink_files(c.path for c in delete)
 
     # Never remove directories; optionally report empty directories is out of scope.
 
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
+import hashlib
 import uuid
 
+# SHA-1 state pre-seeded with the uuid5 namespace; `.copy()` skips re-hashing it.
+_NAMESPACE_URL_SHA1 = hashlib.sha1(uuid.NAMESPACE_URL.bytes)
+
+
+def _uuid5_url_hex(name: str) -> str:
+    """`uuid.uuid5(uuid.NAMESPACE_URL, name).hex` without building a UUID object."""
+    h = _NAMESPACE_URL_SHA1.copy()
+    h.update(name.encode("utf-8"))
+    b = bytearray(h.digest()[:16])
+    b[6] = (b[6] & 0x0F) | 0x50  # version 5
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return b.hex()
+
 
 def derive_relationship_child_canonical_uuid(
     *,
@@ -34,4 +48,4 @@ def derive_relationship_child_canonical_uuid(
         raise ValueError("child_value is required")
 
     name = f"{parent_canonical_uuid}:{relationship_type}:{child_scheme}:{child_value}"
-    return uuid.uuid5(uuid.NAMESPACE_URL, name).hex
+    return _uuid5_url_hex(name)
@@ -1 +1,25 @@
 # File reading/writing helpers
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib parser
+    orjson = None
+
+
+def load_json_file(path: str):
+    """Parse a JSON file, using orjson when it is installed.
+
+    orjson decodes the raw bytes directly (no text decode step) and is several times
+    faster than `json.load` on large SEC companyfacts/submissions files. Both raise a
+    `ValueError` subclass on malformed input.
+    """
+
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -18,60 +18,297 @@ from __future__ import annotations
 
 import os
 import sqlite3
+from contextlib import closing, contextmanager
+from typing import Iterator
 
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "sec.db")
 
+# Same tuning as `db.set_sqlite_pragmas`, kept local so this script runs standalone.
+# journal_mode and foreign_keys cannot change inside a transaction, so apply these
+# before BEGIN. foreign_keys is the sqlite3 default already; it is pinned OFF so a
+# build compiled with enforcement on does not validate FKs during the DDL.
+_MIGRATION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+PRAGMA foreign_keys=OFF;
+"""
+
+
+# Stored in `PRAGMA user_version` after a successful run; a DB already at this version
+# is skipped without any introspection. Bump it whenever migrate() gains a new step.
+SCHEMA_VERSION = 4
+
+# Partial indexes (CREATE INDEX ... WHERE) need SQLite 3.8.0+.
+_SQLITE_HAS_PARTIAL_INDEXES = sqlite3.sqlite_version_info >= (3, 8, 0)
+
+# Table-valued PRAGMA functions (`pragma_table_info(?)`) need SQLite 3.16.0+.
+_SQLITE_HAS_PRAGMA_FUNCTIONS = sqlite3.sqlite_version_info >= (3, 16, 0)
+
+# Rows ANALYZE samples per index (SQLite 3.32+), so refreshing stats after adding an
+# index to a large table such as daily_values stays cheap.
+_ANALYSIS_LIMIT = 1000
+
+# table name -> column names, filled lazily so each table is introspected once per run.
+ColumnCache = dict[str, set[str]]
+
+# Desired columns: table -> ((column, column DDL), ...), applied in order.
+ColumnSpec = dict[str, tuple[tuple[str, str], ...]]
+
+# ("table" | "index", name) pairs from sqlite_master, read once per run.
+SchemaNames = set[tuple[str, str]]
+
+
+def set_migration_pragmas(con: sqlite3.Connection) -> None:
+    """Apply migration PRAGMAs: WAL, fewer syncs, memory temp, big cache, FKs off."""
+
+    con.executescript(_MIGRATION_PRAGMAS)
+
+
+# Connection-scoped settings `set_migration_pragmas` changes; `migration_pragmas`
+# puts the caller's values back. journal_mode is not listed: WAL is a persistent
+# property of the database file (and what the app's engine uses anyway).
+_RESTORED_PRAGMAS = (
+    "synchronous",
+    "temp_store",
+    "cache_size",
+    "mmap_size",
+    "foreign_keys",
+)
+
+
+@contextmanager
+def migration_pragmas(con: sqlite3.Connection) -> Iterator[None]:
+    """Apply `set_migration_pragmas` for the block, then restore the caller's values.
+
+    Must be entered and left outside a transaction: foreign_keys cannot change
+    inside one. The database stays in WAL mode afterwards.
+    """
+
+    saved = {
+        name: con.execute(f"PRAGMA {name}").fetchone()[0] for name in _RESTORED_PRAGMAS
+    }
+    set_migration_pragmas(con)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            con.execute(f"PRAGMA {name}={int(value)}")
+
+
+def check_foreign_keys(cur: sqlite3.Cursor, tables: set[str]) -> None:
+    """Raise IntegrityError if any row in `tables` violates a foreign key.
+
+    Works with foreign_keys OFF, so the migration can validate only what it touched
+    instead of paying for enforcement (or a whole-database check) on every run.
+    """
+
+    for table in sorted(tables):
+        cur.execute(f'PRAGMA foreign_key_check("{table}")')
+        violations = cur.fetchall()
+        if violations:
+            raise sqlite3.IntegrityError(
+                f"foreign key violations in {table}: {violations[:5]}"
+            )
+
 
 def _existing_columns(cur: sqlite3.Cursor, table: str) -> set[str]:
+    if _SQLITE_HAS_PRAGMA_FUNCTIONS:
+        # One parameterised statement for every table, so sqlite3's statement cache
+        # reuses it instead of compiling a new PRAGMA per table name.
+        cur.execute("SELECT name FROM pragma_table_info(?)", (table,))
+        return {row[0] for row in cur.fetchall()}
     cur.execute(f"PRAGMA table_info({table})")
     return {row[1] for row in cur.fetchall()}
 
 
-def add_column_if_missing(cur: sqlite3.Cursor, table: str, col: str, ddl: str) -> bool:
-    cols = _existing_columns(cur, table)
+def load_table_columns(cur: sqlite3.Cursor, tables: list[str]) -> ColumnCache:
+    """Read the columns of every existing table in `tables` in one query.
+
+    Tables that do not exist are left out of the result.
+    """
+
+    if not _SQLITE_HAS_PRAGMA_FUNCTIONS:
+        found = {table: _existing_columns(cur, table) for table in tables}
+        return {table: cols for table, cols in found.items() if cols}
+
+    placeholders = ", ".join("?" * len(tables))
+    cur.execute(
+        "SELECT m.name, p.name FROM sqlite_master AS m "
+        "JOIN pragma_table_info(m.name) AS p "
+        f"WHERE m.type = 'table' AND m.name IN ({placeholders})",
+        tables,
+    )
+    columns: ColumnCache = {}
+    for table, col in cur.fetchall():
+        columns.setdefault(table, set()).add(col)
+    return columns
+
+
+def _table_columns(
+    cur: sqlite3.Cursor, table: str, cache: ColumnCache | None
+) -> set[str]:
+    if cache is None:
+        return _existing_columns(cur, table)
+    cols = cache.get(table)
+    if cols is None:
+        cols = cache[table] = _existing_columns(cur, table)
+    return cols
+
+
+def add_column_if_missing(
+    cur: sqlite3.Cursor,
+    table: str,
+    col: str,
+    ddl: str,
+    *,
+    cache: ColumnCache | None = None,
+) -> bool:
+    """Add `table.col` unless it exists; returns True if the column was added.
+
+    With a `cache`, the table's columns are read once and kept current as columns
+    are added, instead of re-running PRAGMA table_info on every call.
+    """
+
+    cols = _table_columns(cur, table, cache)
     if col in cols:
         return False
     cur.execute(f"ALTER TABLE {table} ADD COLUMN {col} {ddl}")
+    cols.add(col)
     return True
 
 
-def create_index_if_missing(cur: sqlite3.Cursor, *, name: str, ddl: str) -> bool:
+def load_schema_names(cur: sqlite3.Cursor) -> SchemaNames:
+    """Read every table and index name from sqlite_master in one scan."""
+
+    cur.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')")
+    return set(cur.fetchall())
+
+
+def _schema_object_exists(
+    cur: sqlite3.Cursor, kind: str, name: str, existing: SchemaNames | None
+) -> bool:
+    if existing is not None:
+        return (kind, name) in existing
+    cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type=? AND name=? LIMIT 1", (kind, name)
+    )
+    return cur.fetchone() is not None
+
+
+def create_index_if_missing(
+    cur: sqlite3.Cursor,
+    *,
+    name: str,
+    ddl: str,
+    existing: SchemaNames | None = None,
+) -> bool:
     """Create an index if it does not already exist.
 
     Args:
         name: Index name to check in sqlite_master.
         ddl: Full CREATE INDEX statement.
+        existing: Optional `load_schema_names` result to check (and update) instead
+            of querying sqlite_master.
     """
 
-    cur.execute(
-        "SELECT 1 FROM sqlite_master WHERE type='index' AND name=? LIMIT 1", (name,)
-    )
-    if cur.fetchone():
+    if _schema_object_exists(cur, "index", name, existing):
         return False
     cur.execute(ddl)
+    if existing is not None:
+        existing.add(("index", name))
+    return True
+
+
+def drop_index_if_exists(
+    cur: sqlite3.Cursor, *, name: str, existing: SchemaNames | None = None
+) -> bool:
+    """Drop an index (e.g. one made redundant by a composite index) if present."""
+
+    if not _schema_object_exists(cur, "index", name, existing):
+        return False
+    cur.execute(f"DROP INDEX {name}")
+    if existing is not None:
+        existing.discard(("index", name))
     return True
 
 
-def create_table_if_missing(cur: sqlite3.Cursor, *, table: str, ddl: str) -> bool:
+def index_leads_with(cur: sqlite3.Cursor, table: str, columns: tuple[str, ...]) -> bool:
+    """True if a full (non-partial) index on `table` starts with `columns`.
+
+    Such an index can serve any lookup on that column prefix, so a separate index
+    on the same prefix only adds write cost.
+    """
+
+    cur.execute(f"PRAGMA index_list({table})")
+    # Rows: (seq, name, unique, origin, partial).
+    names = [row[1] for row in cur.fetchall() if not row[4]]
+    for name in names:
+        cur.execute(f'PRAGMA index_info("{name}")')
+        # Rows: (seqno, cid, name); seqno gives the key column order.
+        key = tuple(row[2] for row in sorted(cur.fetchall()))
+        if key[: len(columns)] == columns:
+            return True
+    return False
+
+
+def _index_tables(cur: sqlite3.Cursor, names: list[str]) -> set[str]:
+    if not names:
+        return set()
+    placeholders = ", ".join("?" * len(names))
+    cur.execute(
+        "SELECT DISTINCT tbl_name FROM sqlite_master "
+        f"WHERE type = 'index' AND name IN ({placeholders})",
+        names,
+    )
+    return {row[0] for row in cur.fetchall()}
+
+
+def refresh_planner_stats(con: sqlite3.Connection, tables: set[str]) -> None:
+    """ANALYZE `tables` (sampled) and run PRAGMA optimize; call outside a transaction.
+
+    A new index has no sqlite_stat1 row until analyzed, so the planner would keep
+    guessing its selectivity. `PRAGMA optimize` alone only considers tables this
+    connection has queried, which a migration never does.
+    """
+
+    con.execute(f"PRAGMA analysis_limit={_ANALYSIS_LIMIT}")
+    for table in sorted(tables):
+        con.execute(f'ANALYZE "{table}"')
+    con.execute("PRAGMA optimize")
+
+
+def create_table_if_missing(
+    cur: sqlite3.Cursor,
+    *,
+    table: str,
+    ddl: str,
+    existing: SchemaNames | None = None,
+) -> bool:
     """Create a table if it does not already exist.
 
     Args:
         table: Table name.
         ddl: Full CREATE TABLE statement.
+        existing: Optional `load_schema_names` result to check (and update) instead
+            of querying sqlite_master.
 
     Returns:
         True if created, False if already exists.
     """
-    cur.execute(
-        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=? LIMIT 1", (table,)
-    )
-    if cur.fetchone():
+    if _schema_object_exists(cur, "table", table, existing):
         return False
     cur.execute(ddl)
+    if existing is not None:
+        existing.add(("table", table))
     return True
 
 
-def create_data_sources_table_if_missing(cur: sqlite3.Cursor) -> bool:
+def create_data_sources_table_if_missing(
+    cur: sqlite3.Cursor, *, existing: SchemaNames | None = None
+) -> bool:
     """Idempotently create the data_sources registry table."""
 
     ddl = """
@@ -85,10 +322,14 @@ def create_data_sources_table_if_missing(cur: sqlite3.Cursor) -> bool:
     );
     """.strip()
 
-    return create_table_if_missing(cur, table="data_sources", ddl=ddl)
+    return create_table_if_missing(
+        cur, table="data_sources", ddl=ddl, existing=existing
+    )
 
 
-def seed_data_sources_if_missing(cur: sqlite3.Cursor) -> bool:
+def seed_data_sources_if_missing(
+    cur: sqlite3.Cursor, *, existing: SchemaNames | None = None
+) -> bool:
     """Seed initial canonical sources.
 
     Uses INSERT OR IGNORE so it is safe to re-run.
@@ -97,15 +338,9 @@ def seed_data_sources_if_missing(cur: sqlite3.Cursor) -> bool:
     """
 
     # If table does not exist yet, nothing to do.
-    cur.execute(
-        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=? LIMIT 1",
-        ("data_sources",),
-    )
-    if cur.fetchone() is None:
+    if not _schema_object_exists(cur, "table", "data_sources", existing):
         return False
 
-    before = cur.execute("SELECT COUNT(*) FROM data_sources").fetchone()[0]
-
     cur.executemany(
         """
         INSERT OR IGNORE INTO data_sources(name, display_name, description)
@@ -117,11 +352,13 @@ def seed_data_sources_if_missing(cur: sqlite3.Cursor) -> bool:
         ],
     )
 
-    after = cur.execute("SELECT COUNT(*) FROM data_sources").fetchone()[0]
-    return after != before
+    # executemany's rowcount is the total over all rows; ignored rows count 0.
+    return cur.rowcount > 0
 
 
-def create_entity_relationships_table_if_missing(cur: sqlite3.Cursor) -> bool:
+def create_entity_relationships_table_if_missing(
+    cur: sqlite3.Cursor, *, existing: SchemaNames | None = None
+) -> bool:
     """Idempotently create the entity_relationships table."""
 
     # Note: SQLite only enforces FK constraints if PRAGMA foreign_keys=ON.
@@ -142,16 +379,14 @@ def create_entity_relationships_table_if_missing(cur: sqlite3.Cursor) -> bool:
     );
     """.strip()
 
-    changed = create_table_if_missing(cur, table="entity_relationships", ddl=ddl)
+    changed = create_table_if_missing(
+        cur, table="entity_relationships", ddl=ddl, existing=existing
+    )
 
-    # Useful indexes for lookups.
-    changed |= create_index_if_missing(
-        cur,
-        name="ix_entity_relationships_parent_entity_id",
-        ddl=(
-            "CREATE INDEX ix_entity_relationships_parent_entity_id "
-            "ON entity_relationships(parent_entity_id)"
-        ),
+    # Useful indexes for lookups. Parent lookups are served by the unique
+    # constraint's index, which leads with parent_entity_id.
+    changed |= drop_index_if_exists(
+        cur, name="ix_entity_relationships_parent_entity_id", existing=existing
     )
     changed |= create_index_if_missing(
         cur,
@@ -160,12 +395,15 @@ def create_entity_relationships_table_if_missing(cur: sqlite3.Cursor) -> bool:
             "CREATE INDEX ix_entity_relationships_child_entity_id "
             "ON entity_relationships(child_entity_id)"
         ),
+        existing=existing,
     )
 
     return changed
 
 
-def create_sec_filings_table_if_missing(cur: sqlite3.Cursor) -> bool:
+def create_sec_filings_table_if_missing(
+    cur: sqlite3.Cursor, *, existing: SchemaNames | None = None
+) -> bool:
     """Idempotently create the sec_filings table."""
 
     ddl = """
@@ -189,12 +427,13 @@ def create_sec_filings_table_if_missing(cur: sqlite3.Cursor) -> bool:
     );
     """.strip()
 
-    changed = create_table_if_missing(cur, table="sec_filings", ddl=ddl)
+    changed = create_table_if_missing(
+        cur, table="sec_filings", ddl=ddl, existing=existing
+    )
 
-    changed |= create_index_if_missing(
-        cur,
-        name="ix_sec_filings_entity_id",
-        ddl="CREATE INDEX ix_sec_filings_entity_id ON sec_filings(entity_id)",
+    # Entity lookups are served by the unique constraint's index.
+    changed |= drop_index_if_exists(
+        cur, name="ix_sec_filings_entity_id", existing=existing
     )
     changed |= create_index_if_missing(
         cur,
@@ -203,12 +442,27 @@ def create_sec_filings_table_if_missing(cur: sqlite3.Cursor) -> bool:
             "CREATE INDEX ix_sec_filings_accession_number "
             "ON sec_filings(accession_number)"
         ),
+        existing=existing,
     )
+    if _SQLITE_HAS_PARTIAL_INDEXES:
+        # Ingest work queue (`fetch_status = 'pending'` ordered by id); only pending
+        # rows are indexed, so the index stays small as filings get fetched.
+        changed |= create_index_if_missing(
+            cur,
+            name="ix_sec_filings_pending",
+            ddl=(
+                "CREATE INDEX ix_sec_filings_pending ON sec_filings(id) "
+                "WHERE fetch_status = 'pending'"
+            ),
+            existing=existing,
+        )
 
     return changed
 
 
-def create_sec_tickers_table_if_missing(cur: sqlite3.Cursor) -> bool:
+def create_sec_tickers_table_if_missing(
+    cur: sqlite3.Cursor, *, existing: SchemaNames | None = None
+) -> bool:
     """Idempotently create the sec_tickers table."""
 
     ddl = """
@@ -225,28 +479,33 @@ def create_sec_tickers_table_if_missing(cur: sqlite3.Cursor) -> bool:
     );
     """.strip()
 
-    changed = create_table_if_missing(cur, table="sec_tickers", ddl=ddl)
+    changed = create_table_if_missing(
+        cur, table="sec_tickers", ddl=ddl, existing=existing
+    )
 
     changed |= create_index_if_missing(
         cur,
         name="ix_sec_tickers_entity_id",
         ddl="CREATE INDEX ix_sec_tickers_entity_id ON sec_tickers(entity_id)",
+        existing=existing,
     )
-    changed |= create_index_if_missing(
-        cur,
-        name="ix_sec_tickers_ticker",
-        ddl="CREATE INDEX ix_sec_tickers_ticker ON sec_tickers(ticker)",
+    # Ticker lookups are served by the unique constraint's index.
+    changed |= drop_index_if_exists(
+        cur, name="ix_sec_tickers_ticker", existing=existing
     )
     changed |= create_index_if_missing(
         cur,
         name="ix_sec_tickers_exchange",
         ddl="CREATE INDEX ix_sec_tickers_exchange ON sec_tickers(exchange)",
+        existing=existing,
     )
 
     return changed
 
 
-def create_sec_filing_documents_table_if_missing(cur: sqlite3.Cursor) -> bool:
+def create_sec_filing_documents_table_if_missing(
+    cur: sqlite3.Cursor, *, existing: SchemaNames | None = None
+) -> bool:
     """Idempotently create the sec_filing_documents table."""
 
     ddl = """
@@ -266,7 +525,9 @@ def create_sec_filing_documents_table_if_missing(cur: sqlite3.Cursor) -> bool:
     );
     """.strip()
 
-    changed = create_table_if_missing(cur, table="sec_filing_documents", ddl=ddl)
+    changed = create_table_if_missing(
+        cur, table="sec_filing_documents", ddl=ddl, existing=existing
+    )
 
     changed |= create_index_if_missing(
         cur,
@@ -275,221 +536,209 @@ def create_sec_filing_documents_table_if_missing(cur: sqlite3.Cursor) -> bool:
             "CREATE INDEX ix_sec_filing_documents_filing_id "
             "ON sec_filing_documents(filing_id)"
         ),
+        existing=existing,
     )
 
     return changed
 
 
-def migrate_entity_identifiers_audit_columns(cur: sqlite3.Cursor) -> bool:
-    """Add auditability columns to entity_identifiers (idempotent).
-
-    - confidence: TEXT NOT NULL DEFAULT 'authoritative'
-    - added_at: DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'
-    - last_seen_at: DATETIME NULL
-
-    Note: SQLite cannot use Python callables as DEFAULTs in ALTER TABLE,
-    and also cannot use CURRENT_TIMESTAMP in ALTER TABLE ADD COLUMN.
-    We use a static default like '1970-01-01 00:00:00'.
+# Columns entity_identifiers needs for auditability.
+# SQLite cannot use Python callables as DEFAULTs in ALTER TABLE, and also cannot use
+# CURRENT_TIMESTAMP in ALTER TABLE ADD COLUMN, so added_at gets a static default.
+ENTITY_IDENTIFIERS_AUDIT_COLUMNS: ColumnSpec = {
+    "entity_identifiers": (
+        ("confidence", "TEXT NOT NULL DEFAULT 'authoritative'"),
+        ("added_at", "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'"),
+        ("last_seen_at", "DATETIME NULL"),
+    ),
+}
+
+FILE_PROCESSING_TRACKING_COLUMNS: ColumnSpec = {
+    "file_processing": (
+        ("source", "TEXT NOT NULL DEFAULT 'local'"),
+        ("record_count", "INTEGER NULL"),
+    ),
+}
+
+# Multi-source / traceability columns.
+MULTISOURCE_COLUMNS: ColumnSpec = {
+    "value_names": (("namespace", "TEXT NULL"),),
+    "daily_values": (
+        ("source", "TEXT NULL"),
+        ("period_type", "TEXT NULL"),
+        ("start_date_id", "INTEGER NULL REFERENCES dates(id)"),
+        ("accession_number", "TEXT NULL"),
+    ),
+    "entity_metadata": (
+        ("data_sources", "TEXT NULL"),
+        ("last_sec_sync_at", "DATETIME NULL"),
+    ),
+}
+
+# Columns `main()` ensures on top of the specs above.
+SCHEMA_ADDITIONS: ColumnSpec = {
+    "entity_metadata": (
+        ("sic", "TEXT"),
+        ("sic_description", "TEXT"),
+        ("state_of_incorporation", "TEXT"),
+        ("fiscal_year_end", "TEXT"),
+        ("filer_category", "TEXT"),
+        ("entity_type", "TEXT"),
+        ("website", "TEXT"),
+        ("phone", "TEXT"),
+        ("ein", "TEXT"),
+        ("tickers", "TEXT"),
+        ("exchanges", "TEXT"),
+        ("business_street1", "TEXT"),
+        ("business_street2", "TEXT"),
+        ("business_city", "TEXT"),
+        ("business_state", "TEXT"),
+        ("business_zipcode", "TEXT"),
+        ("business_country", "TEXT"),
+        # Additional fields from submissions analysis
+        ("lei", "TEXT"),
+        ("investor_website", "TEXT"),
+        ("entity_description", "TEXT"),
+        ("owner_organization", "TEXT"),
+        ("state_of_incorporation_description", "TEXT"),
+        ("sec_flags", "TEXT"),
+        ("has_insider_transactions_as_owner", "INTEGER"),
+        ("has_insider_transactions_as_issuer", "INTEGER"),
+        # Mailing address fields
+        ("mailing_street1", "TEXT"),
+        ("mailing_street2", "TEXT"),
+        ("mailing_city", "TEXT"),
+        ("mailing_state", "TEXT"),
+        ("mailing_zipcode", "TEXT"),
+        ("mailing_country", "TEXT"),
+        # Former names (stored as JSON)
+        ("former_names", "TEXT"),
+    ),
+    # Legacy metadata columns (now moved to entity_metadata).
+    "entities": (
+        ("company_name", "TEXT"),
+        ("country", "TEXT"),
+        ("sector", "TEXT"),
+    ),
+    # Type changes require a rebuild; just ensure the column. If it already exists as
+    # INTEGER, SQLite is dynamically typed and will still store TEXT.
+    "value_names": (("source", "TEXT"),),
+}
+
+
+def apply_schema(
+    cur: sqlite3.Cursor, spec: ColumnSpec, *, cache: ColumnCache | None = None
+) -> bool:
+    """Add every column in `spec` the DB does not have yet (idempotent).
+
+    The current columns of all spec tables not already in `cache` are read with one
+    query. Columns are added one ALTER at a time rather than via `executescript`,
+    which would COMMIT the caller's open transaction first.
     """
 
+    if cache is None:
+        cache = {}
+    unread = [table for table in spec if table not in cache]
+    if unread:
+        cache.update(load_table_columns(cur, unread))
+
     changed = False
-    changed |= add_column_if_missing(
-        cur,
-        "entity_identifiers",
-        "confidence",
-        "TEXT NOT NULL DEFAULT 'authoritative'",
-    )
-    changed |= add_column_if_missing(
-        cur,
-        "entity_identifiers",
-        "added_at",
-        "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'",
-    )
-    changed |= add_column_if_missing(
-        cur,
-        "entity_identifiers",
-        "last_seen_at",
-        "DATETIME NULL",
-    )
+    for table, columns in spec.items():
+        for col, ddl in columns:
+            changed |= add_column_if_missing(cur, table, col, ddl, cache=cache)
     return changed
 
 
-def migrate_file_processing_tracking_columns(cur: sqlite3.Cursor) -> bool:
-    """Add tracking columns to file_processing (idempotent).
+def migrate_entity_identifiers_audit_columns(
+    cur: sqlite3.Cursor, *, cache: ColumnCache | None = None
+) -> bool:
+    """Add auditability columns to entity_identifiers (idempotent)."""
 
-    - source: TEXT NOT NULL DEFAULT 'local'
-    - record_count: INTEGER NULL
-    """
+    return apply_schema(cur, ENTITY_IDENTIFIERS_AUDIT_COLUMNS, cache=cache)
 
-    changed = False
-    changed |= add_column_if_missing(
-        cur,
-        "file_processing",
-        "source",
-        "TEXT NOT NULL DEFAULT 'local'",
-    )
-    changed |= add_column_if_missing(
-        cur,
-        "file_processing",
-        "record_count",
-        "INTEGER NULL",
-    )
-    return changed
 
+def migrate_file_processing_tracking_columns(
+    cur: sqlite3.Cursor, *, cache: ColumnCache | None = None
+) -> bool:
+    """Add tracking columns to file_processing (idempotent)."""
+
+    return apply_schema(cur, FILE_PROCESSING_TRACKING_COLUMNS, cache=cache)
 
-def migrate_multisource_schema_columns(cur: sqlite3.Cursor) -> bool:
+
+def migrate_multisource_schema_columns(
+    cur: sqlite3.Cursor, *, cache: ColumnCache | None = None
+) -> bool:
     """Add multi-source / traceability columns (idempotent)."""
 
-    changed = False
+    return apply_schema(cur, MULTISOURCE_COLUMNS, cache=cache)
 
-    # value_names
-    changed |= add_column_if_missing(cur, "value_names", "namespace", "TEXT NULL")
 
-    # daily_values
-    changed |= add_column_if_missing(cur, "daily_values", "source", "TEXT NULL")
-    changed |= add_column_if_missing(cur, "daily_values", "period_type", "TEXT NULL")
-    changed |= add_column_if_missing(
-        cur,
-        "daily_values",
-        "start_date_id",
-        "INTEGER NULL REFERENCES dates(id)",
-    )
-    changed |= add_column_if_missing(
-        cur,
-        "daily_values",
-        "accession_number",
-        "TEXT NULL",
-    )
+def add_schema_additions(
+    cur: sqlite3.Cursor, *, cache: ColumnCache | None = None
+) -> bool:
+    """Add every missing column listed in `SCHEMA_ADDITIONS` (idempotent)."""
 
-    # entity_metadata
-    changed |= add_column_if_missing(
-        cur, "entity_metadata", "data_sources", "TEXT NULL"
-    )
-    changed |= add_column_if_missing(
-        cur,
-        "entity_metadata",
-        "last_sec_sync_at",
-        "DATETIME NULL",
+    return apply_schema(cur, SCHEMA_ADDITIONS, cache=cache)
+
+
+_COLUMN_SPEC_TABLES = {
+    table
+    for spec in (
+        ENTITY_IDENTIFIERS_AUDIT_COLUMNS,
+        FILE_PROCESSING_TRACKING_COLUMNS,
+        MULTISOURCE_COLUMNS,
+        SCHEMA_ADDITIONS,
     )
+    for table in spec
+}
 
-    return changed
 
+def migrate(con: sqlite3.Connection) -> bool:
+    """Bring the schema on `con` up to date; returns True if anything changed.
+
+    Runs as one BEGIN IMMEDIATE transaction that is rolled back on any error.
+    `con` must not be inside a transaction (journal_mode cannot change there);
+    open it with `isolation_level=None` so sqlite3 does not begin one implicitly.
+
+    The connection's synchronous/temp_store/cache_size/mmap_size/foreign_keys
+    settings are restored afterwards; the database itself is left in WAL mode.
+    """
+
+    with migration_pragmas(con):
+        return _migrate(con)
 
-def main() -> None:
-    if not os.path.exists(DB_PATH):
-        raise SystemExit(f"DB not found: {DB_PATH}")
 
-    con = sqlite3.connect(DB_PATH)
+def _migrate(con: sqlite3.Connection) -> bool:
+    cur = con.cursor()
+    cur.execute("BEGIN IMMEDIATE")
     try:
-        cur = con.cursor()
+        if cur.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            con.rollback()
+            return False
+        existing = load_schema_names(cur)
+        schema_before = set(existing)
+        # Read every spec table's columns up front (one query) so the tables this run
+        # alters can be found by comparing against the cache afterwards.
+        cache = load_table_columns(cur, sorted(_COLUMN_SPEC_TABLES))
+        columns_before = {table: set(cols) for table, cols in cache.items()}
 
         changed = False
 
         # --- new tables ---
-        changed |= create_data_sources_table_if_missing(cur)
-        changed |= create_entity_relationships_table_if_missing(cur)
-        changed |= create_sec_filings_table_if_missing(cur)
-        changed |= create_sec_tickers_table_if_missing(cur)
-        changed |= create_sec_filing_documents_table_if_missing(cur)
+        changed |= create_data_sources_table_if_missing(cur, existing=existing)
+        changed |= create_entity_relationships_table_if_missing(cur, existing=existing)
+        changed |= create_sec_filings_table_if_missing(cur, existing=existing)
+        changed |= create_sec_tickers_table_if_missing(cur, existing=existing)
+        changed |= create_sec_filing_documents_table_if_missing(cur, existing=existing)
 
         # Seed lookup tables.
-        changed |= seed_data_sources_if_missing(cur)
+        changed |= seed_data_sources_if_missing(cur, existing=existing)
 
         # --- column migrations ---
-        changed |= migrate_entity_identifiers_audit_columns(cur)
-        changed |= migrate_file_processing_tracking_columns(cur)
-        changed |= migrate_multisource_schema_columns(cur)
-
-        # entity_metadata: add new metadata columns
-        changed |= add_column_if_missing(cur, "entity_metadata", "sic", "TEXT")
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "sic_description", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "state_of_incorporation", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "fiscal_year_end", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "filer_category", "TEXT"
-        )
-        changed |= add_column_if_missing(cur, "entity_metadata", "entity_type", "TEXT")
-        changed |= add_column_if_missing(cur, "entity_metadata", "website", "TEXT")
-        changed |= add_column_if_missing(cur, "entity_metadata", "phone", "TEXT")
-        changed |= add_column_if_missing(cur, "entity_metadata", "ein", "TEXT")
-        changed |= add_column_if_missing(cur, "entity_metadata", "tickers", "TEXT")
-        changed |= add_column_if_missing(cur, "entity_metadata", "exchanges", "TEXT")
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "business_street1", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "business_street2", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "business_city", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "business_state", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "business_zipcode", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "business_country", "TEXT"
-        )
-
-        # Additional fields from submissions analysis
-        changed |= add_column_if_missing(cur, "entity_metadata", "lei", "TEXT")
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "investor_website", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "entity_description", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "owner_organization", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "state_of_incorporation_description", "TEXT"
-        )
-        changed |= add_column_if_missing(cur, "entity_metadata", "sec_flags", "TEXT")
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "has_insider_transactions_as_owner", "INTEGER"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "has_insider_transactions_as_issuer", "INTEGER"
-        )
-
-        # Mailing address fields
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "mailing_street1", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "mailing_street2", "TEXT"
-        )
-        changed |= add_column_if_missing(cur, "entity_metadata", "mailing_city", "TEXT")
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "mailing_state", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "mailing_zipcode", "TEXT"
-        )
-        changed |= add_column_if_missing(
-            cur, "entity_metadata", "mailing_country", "TEXT"
-        )
-
-        # Former names (stored as JSON)
-        changed |= add_column_if_missing(cur, "entity_metadata", "former_names", "TEXT")
-
-        # entities: add metadata columns (legacy - now moved to entity_metadata table)
-        changed |= add_column_if_missing(cur, "entities", "company_name", "TEXT")
-        changed |= add_column_if_missing(cur, "entities", "country", "TEXT")
-        changed |= add_column_if_missing(cur, "entities", "sector", "TEXT")
-
-        # value_names: ensure source exists (type changes require rebuild; just ensure column)
-        # (If it already exists as INTEGER, SQLite is dynamic typed and will still store TEXT.)
-        changed |= add_column_if_missing(cur, "value_names", "source", "TEXT")
+        changed |= migrate_entity_identifiers_audit_columns(cur, cache=cache)
+        changed |= migrate_file_processing_tracking_columns(cur, cache=cache)
+        changed |= migrate_multisource_schema_columns(cur, cache=cache)
+        changed |= add_schema_additions(cur, cache=cache)
 
         # daily_values: if value column exists as FLOAT, SQLite will still let you store TEXT.
         # No action required; keep here for visibility.
@@ -498,30 +747,68 @@ def main() -> None:
         # /check-cik uses a join on daily_values.entity_id and sorts by entities.cik.
         # /daily-values filters by daily_values.entity_id.
         # /check-cik cards load metadata by entity_metadata.entity_id.
-        changed |= create_index_if_missing(
-            cur,
-            name="ix_daily_values_entity_id",
-            ddl="CREATE INDEX ix_daily_values_entity_id ON daily_values(entity_id)",
+        # The uq_daily_values_entity_date_value index already leads with
+        # (entity_id, date_id); only DBs created without that constraint need one.
+        if not index_leads_with(cur, "daily_values", ("entity_id", "date_id")):
+            changed |= create_index_if_missing(
+                cur,
+                name="ix_daily_values_entity_date",
+                ddl=(
+                    "CREATE INDEX ix_daily_values_entity_date "
+                    "ON daily_values(entity_id, date_id)"
+                ),
+                existing=existing,
+            )
+        changed |= drop_index_if_exists(
+            cur, name="ix_daily_values_entity_id", existing=existing
         )
         changed |= create_index_if_missing(
             cur,
             name="ix_entities_cik",
             ddl="CREATE INDEX ix_entities_cik ON entities(cik)",
+            existing=existing,
         )
         changed |= create_index_if_missing(
             cur,
             name="ix_entity_metadata_entity_id",
             ddl="CREATE INDEX ix_entity_metadata_entity_id ON entity_metadata(entity_id)",
+            existing=existing,
         )
 
-        if changed:
-            con.commit()
-            print("Migration applied successfully.")
-        else:
-            print("No changes needed; schema already up to date.")
+        new_indexes = [n for kind, n in existing - schema_before if kind == "index"]
+        indexed_tables = _index_tables(cur, new_indexes)
 
-    finally:
-        con.close()
+        # FKs are off during the DDL; validate just the tables created or altered.
+        created = {n for kind, n in existing - schema_before if kind == "table"}
+        altered = {t for t, cols in cache.items() if cols != columns_before.get(t)}
+        check_foreign_keys(cur, created | altered)
+
+        # Part of the same transaction, so the version only moves with the DDL.
+        cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        con.commit()
+    except BaseException:
+        if con.in_transaction:
+            con.rollback()
+        raise
+
+    refresh_planner_stats(con, indexed_tables)
+    return changed
+
+
+def main() -> None:
+    if not os.path.exists(DB_PATH):
+        raise SystemExit(f"DB not found: {DB_PATH}")
+
+    # Autocommit mode plus one explicit transaction: Python's sqlite3 does not open
+    # implicit transactions for DDL, so each ALTER/CREATE would otherwise commit (and
+    # sync the journal) on its own. IMMEDIATE takes the write lock up front.
+    with closing(sqlite3.connect(DB_PATH, isolation_level=None)) as con:
+        changed = migrate(con)
+
+    if changed:
+        print("Migration applied successfully.")
+    else:
+        print("No changes needed; schema already up to date.")
 
 
 if __name__ == "__main__":
@@ -1,39 +1,112 @@
 import sqlite3
 import os
-from utils.time_utils import utcnow
+from contextlib import closing
+
+from utils.migrate_sqlite_schema import (
+    load_schema_names,
+    load_table_columns,
+    migration_pragmas,
+)
 
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "sec.db")
 
-conn = sqlite3.connect(DB_PATH)
-c = conn.cursor()
 
-# 1. Rename old table
-c.execute("""ALTER TABLE value_names RENAME TO value_names_old""")
+def migrate(conn: sqlite3.Connection) -> bool:
+    """Rebuild value_names with the source/added_on/valid_until columns.
 
-# 2. Create new table with updated schema
-c.execute(
+    Returns False (and only cleans up a leftover value_names_old) if the table was
+    already rebuilt. `conn` must be in autocommit mode (`isolation_level=None`) and
+    not inside a transaction. Its connection settings are restored afterwards; the
+    database itself is left in WAL mode.
     """
-CREATE TABLE value_names (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT UNIQUE NOT NULL,
-    source INTEGER NOT NULL DEFAULT 1,
-    added_on DATETIME NOT NULL,
-    valid_until DATETIME
-)
-"""
-)
 
-# 3. Copy data from old table to new table
-c.execute(
-    """
-INSERT INTO value_names (id, name, source, added_on, valid_until)
-SELECT id, name, 1, ?, NULL FROM value_names_old
-""",
-    (utcnow().isoformat(),),
-)
+    # WAL/fewer syncs/in-memory temp b-trees for the full-table copy below.
+    with migration_pragmas(conn):
+        return _migrate(conn)
+
+
+def _migrate(conn: sqlite3.Connection) -> bool:
+    c = conn.cursor()
+
+    # One explicit transaction so the rename/create/copy commit (or fail) together;
+    # Python's sqlite3 would otherwise autocommit each DDL statement separately.
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-runs are no-ops: added_on only exists once the table has been rebuilt
+        # (current model DBs have it too, and must not be rebuilt into this narrower
+        # schema).
+        if "added_on" in load_table_columns(c, ["value_names"]).get("value_names", ()):
+            # A previous run may have committed the copy but stopped before the DROP.
+            if ("table", "value_names_old") in load_schema_names(c):
+                c.execute("""DROP TABLE value_names_old""")
+            conn.commit()
+            return False
+
+        # 1. Rename old table. Since SQLite 3.26 a RENAME also rewrites other tables'
+        # FOREIGN KEY clauses, which would repoint daily_values.value_name_id at
+        # value_names_old (dropped below); the legacy behaviour is enabled for this
+        # one statement only.
+        legacy_alter = c.execute("PRAGMA legacy_alter_table").fetchone()[0]
+        c.execute("PRAGMA legacy_alter_table=ON")
+        try:
+            c.execute("""ALTER TABLE value_names RENAME TO value_names_old""")
+        finally:
+            c.execute(f"PRAGMA legacy_alter_table={int(legacy_alter)}")
+
+        # 2. Create new table with updated schema. The UNIQUE(name) index is built in
+        # step 4, once the rows are in, rather than maintained row by row during the
+        # copy.
+        c.execute(
+            """
+        CREATE TABLE value_names (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            source INTEGER NOT NULL DEFAULT 1,
+            added_on DATETIME NOT NULL,
+            valid_until DATETIME
+        )
+        """
+        )
+
+        # 3. Copy data from old table to new table. added_on is computed by SQLite
+        # (UTC, ISO 8601); 'now' is fixed for the whole statement, so every row gets
+        # one value.
+        c.execute(
+            """
+        INSERT INTO value_names (id, name, source, added_on, valid_until)
+        SELECT id, name, 1, strftime('%Y-%m-%dT%H:%M:%fZ', 'now'), NULL
+        FROM value_names_old
+        """
+        )
+
+        # 4. Enforce unique names now that the data is loaded
+        c.execute("""CREATE UNIQUE INDEX ix_value_names_name ON value_names (name)""")
+
+        conn.commit()
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+    # 5. Drop old table in its own short transaction, after the copy is durable, so
+    # the write lock is not held for the page frees and the WAL can checkpoint in
+    # between.
+    c.execute("""DROP TABLE value_names_old""")
+    return True
+
+
+def main() -> None:
+    if not os.path.exists(DB_PATH):
+        raise SystemExit(f"DB not found: {DB_PATH}")
+
+    with closing(sqlite3.connect(DB_PATH, isolation_level=None)) as conn:
+        changed = migrate(conn)
+
+    if changed:
+        print("value_names migrated.")
+    else:
+        print("No changes needed; value_names already migrated.")
 
-# 4. Drop old table
-c.execute("""DROP TABLE value_names_old""")
 
-conn.commit()
-conn.close()
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import argparse
 import json
 import logging
+import re
 import threading
 import multiprocessing
 from multiprocessing import Process
@@ -50,12 +51,13 @@ from datetime import datetime
 from functools import wraps
 from time import perf_counter
 
-from sqlalchemy import create_engine, func, text
+from sqlalchemy import create_engine, event, func, select, text
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as SASession
 from sqlalchemy.orm import sessionmaker
 
+from db import set_sqlite_pragmas
 from logging_utils import get_logger
 from models import Base
 from models.daily_values import DailyValue
@@ -68,6 +70,7 @@ from models.value_names import ValueName
 from models.entity_identifiers import EntityIdentifier
 from models.sec_filings import SecFiling
 from models.sec_tickers import SecTicker
+from utils.file_ops import load_json_file
 from utils.time_utils import parse_ymd_date, utcnow
 
 import uuid
@@ -244,6 +247,8 @@ def _make_engine(db_path: str):
         connect_args={"check_same_thread": False, "timeout": 30},
         pool_pre_ping=True,
     )
+    # Same per-connection PRAGMAs as the app engine (WAL, cache/mmap/temp_store).
+    event.listen(eng, "connect", set_sqlite_pragmas)
     return eng
 
 
@@ -288,35 +293,63 @@ def _safe_str(val, max_len: int = 4000) -> str:
     return s[:max_len]
 
 
+# Rows per executemany() call for every bulk insert here (daily_values, sec_filings,
+# sec_tickers, entity_identifiers). executemany binds each row separately, so SQLite's
+# bound-parameter limit (999 by default) doesn't apply; this only caps memory/latency.
+EXECUTEMANY_BATCH_SIZE = 10_000
+
+# Core (table-level) statement so session.execute() returns a CursorResult with an
+# accurate rowcount instead of going through the ORM bulk-insert path.
+_DAILY_VALUES_INSERT_OR_IGNORE = sqlite_insert(DailyValue.__table__).prefix_with(
+    "OR IGNORE"
+)
+
+_SEC_FILINGS_INSERT_OR_IGNORE = sqlite_insert(SecFiling.__table__).prefix_with(
+    "OR IGNORE"
+)
+# Plain INSERTs (no OR IGNORE): a ticker or identifier inserted for another entity
+# after the preload lookup must surface as IntegrityError, like the per-row path.
+_SEC_TICKERS_INSERT = sqlite_insert(SecTicker.__table__)
+_ENTITY_IDENTIFIERS_INSERT = sqlite_insert(EntityIdentifier.__table__)
+
+# Keys per `IN (...)` lookup; stays under SQLite's default 999 bound-parameter limit
+# with room for the other predicates.
+SQLITE_IN_CLAUSE_BATCH_SIZE = 500
+
+
 def _insert_daily_values_ignore_bulk(
     session: SASession | None, rows: list[dict]
 ) -> int:
     session = _default_session(session)
     """Bulk insert daily_values rows using SQLite INSERT OR IGNORE.
 
-    SQLite enforces a limit on the number of bound parameters per statement
-    (typically 999 unless SQLite was compiled with a higher value). Since each
-    `daily_values` row binds 4 columns (entity_id, date_id, value_name_id, value),
-    we must chunk large inserts to stay below that limit.
+    Rows are sent via DB-API executemany in batches of `EXECUTEMANY_BATCH_SIZE`,
+    reusing one compiled statement.
 
     Returns best-effort count of inserted rows.
     """
+    return _executemany_counted(session, _DAILY_VALUES_INSERT_OR_IGNORE, rows)
+
+
+def _executemany_counted(session: SASession, stmt, rows: list[dict]) -> int:
+    """Run a Core INSERT for `rows` via executemany in batches; returns rows written.
+
+    Batches are `EXECUTEMANY_BATCH_SIZE` rows. All rows must share the same
+    keys. With `OR IGNORE` statements the count excludes skipped duplicates.
+    """
     if not rows:
         return 0
 
-    # 4 bound parameters per row for the statement we generate.
-    # Keep some margin to account for any additional parameters SQLAlchemy might add.
-    SQLITE_MAX_VARS_DEFAULT = 999
-    PARAMS_PER_ROW = 4
-    max_rows_per_chunk = max(1, (SQLITE_MAX_VARS_DEFAULT // PARAMS_PER_ROW) - 5)
+    # These are plain Core statements built once at import, so skip the ORM
+    # execution layer per batch: autoflush once (rows may reference pending
+    # entities), then execute on the session's connection directly.
+    session.flush()
+    conn = session.connection()
 
     inserted = 0
-    for i in range(0, len(rows), max_rows_per_chunk):
-        chunk = rows[i : i + max_rows_per_chunk]
-        stmt = sqlite_insert(DailyValue).values(chunk).prefix_with("OR IGNORE")
-        res = session.execute(stmt)
-        # Ensure SQLite has actually executed the INSERT so rowcount is accurate.
-        session.flush()
+    for i in range(0, len(rows), EXECUTEMANY_BATCH_SIZE):
+        chunk = rows[i : i + EXECUTEMANY_BATCH_SIZE]
+        res = conn.execute(stmt, chunk)
         inserted += int(getattr(res, "rowcount", 0) or 0)
 
     return inserted
@@ -335,19 +368,16 @@ def _insert_daily_value_ignore(
 
     Returns True if inserted, False if ignored as duplicate.
     """
-    stmt = (
-        sqlite_insert(DailyValue)
-        .values(
-            entity_id=entity_id,
-            date_id=date_id,
-            value_name_id=value_name_id,
-            value=value,
-        )
-        .prefix_with("OR IGNORE")
+    row = dict(
+        entity_id=entity_id,
+        date_id=date_id,
+        value_name_id=value_name_id,
+        value=value,
     )
-    res = session.execute(stmt)
-    # SQLite rowcount == 1 if inserted, 0 if ignored
-    return bool(getattr(res, "rowcount", 0))
+    # Called once per value, so execute on the connection without the per-call
+    # flush of the batch path. SQLite rowcount == 1 if inserted, 0 if ignored.
+    res = session.connection().execute(_DAILY_VALUES_INSERT_OR_IGNORE, row)
+    return res.rowcount == 1
 
 
 def _normalize_identifier_value(scheme: str, value: str) -> str:
@@ -737,6 +767,32 @@ def get_or_create_date_entry(date_str, session: SASession | None = None):
     return date_entry
 
 
+def _preload_dimension_caches(
+    session: SASession,
+    *,
+    unit_cache: dict[str, int],
+    value_name_cache: dict[tuple[str, int | None], int],
+    date_cache: dict[str, int],
+) -> None:
+    """Warm the per-run unit/value-name/date id caches with one scan per table.
+
+    Keys match what the `get_*_id_cached` helpers look up (unit name,
+    (value name, unit_id), ISO date string), so rows that already exist never
+    hit `get_or_create_*`; anything missing still falls through to it.
+    """
+    unit_cache.update(session.execute(select(Unit.name, Unit.id)).all())
+    value_name_cache.update(
+        ((name, unit_id), vn_id)
+        for name, unit_id, vn_id in session.execute(
+            select(ValueName.name, ValueName.unit_id, ValueName.id)
+        )
+    )
+    date_cache.update(
+        (d.isoformat(), date_id)
+        for d, date_id in session.execute(select(DateEntry.date, DateEntry.id))
+    )
+
+
 def delete_all_daily_values(session: SASession | None = None):
     session = _default_session(session)
     """Delete all rows from `daily_values`.
@@ -790,6 +846,11 @@ def _log_unprocessed(
     error_files.append(f"{source}:{filename}")
 
 
+# Common shapes ('1750', '0000001750', 'CIK0000001750') without the int()/except
+# round-trip; anything else falls through to the lenient path below.
+_CIK_RE = re.compile(r"\s*(?:CIK)?0*(\d+)\s*", re.ASCII)
+
+
 def _normalize_cik(raw) -> str | None:
     """Normalize a CIK into 10-digit, zero-padded form.
 
@@ -797,6 +858,10 @@ def _normalize_cik(raw) -> str | None:
     """
     if raw is None:
         return None
+    if isinstance(raw, str):
+        m = _CIK_RE.fullmatch(raw)
+        if m:
+            return m.group(1).zfill(10)
     try:
         return str(int(raw)).zfill(10)
     except Exception:
@@ -824,6 +889,40 @@ def infer_cik_from_filename(name: str) -> str | None:
     return "".join(digits) or None
 
 
+# submissions JSON key -> EntityMetadata column, for fields copied as stripped strings.
+_SUBMISSIONS_STR_FIELDS: tuple[tuple[str, str], ...] = (
+    ("sic", "sic"),
+    ("sicDescription", "sic_description"),
+    ("stateOfIncorporation", "state_of_incorporation"),
+    ("stateOfIncorporationDescription", "state_of_incorporation_description"),
+    ("fiscalYearEnd", "fiscal_year_end"),
+    ("category", "filer_category"),
+    ("entityType", "entity_type"),
+    ("website", "website"),
+    ("phone", "phone"),
+    ("ein", "ein"),
+    ("lei", "lei"),
+    ("investorWebsite", "investor_website"),
+    ("description", "entity_description"),
+    ("ownerOrg", "owner_organization"),
+    ("flags", "sec_flags"),
+)
+
+# addresses.{business,mailing} key -> column suffix (some payloads add "country").
+_ADDRESS_FIELD_SUFFIXES: tuple[tuple[str, str], ...] = (
+    ("street1", "street1"),
+    ("street2", "street2"),
+    ("city", "city"),
+    ("stateOrCountry", "state"),
+    ("zipCode", "zipcode"),
+    ("country", "country"),
+)
+_ADDRESS_FIELDS: tuple[tuple[str, tuple[tuple[str, str], ...]], ...] = tuple(
+    (kind, tuple((src, f"{kind}_{suffix}") for src, suffix in _ADDRESS_FIELD_SUFFIXES))
+    for kind in ("business", "mailing")
+)
+
+
 def extract_metadata_from_submissions(data: dict) -> dict:
     """Extract entity metadata fields from a submissions JSON payload.
 
@@ -836,49 +935,13 @@ def extract_metadata_from_submissions(data: dict) -> dict:
     if name and isinstance(name, str):
         metadata["company_name"] = name.strip()
 
-    # SIC (Standard Industrial Classification)
-    if data.get("sic"):
-        metadata["sic"] = str(data["sic"]).strip()
-    if data.get("sicDescription"):
-        metadata["sic_description"] = str(data["sicDescription"]).strip()
-
-    # Incorporation and fiscal info
-    if data.get("stateOfIncorporation"):
-        metadata["state_of_incorporation"] = str(data["stateOfIncorporation"]).strip()
-    if data.get("stateOfIncorporationDescription"):
-        metadata["state_of_incorporation_description"] = str(
-            data["stateOfIncorporationDescription"]
-        ).strip()
-    if data.get("fiscalYearEnd"):
-        metadata["fiscal_year_end"] = str(data["fiscalYearEnd"]).strip()
-
-    # Filer category and entity type
-    if data.get("category"):
-        metadata["filer_category"] = str(data["category"]).strip()
-    if data.get("entityType"):
-        metadata["entity_type"] = str(data["entityType"]).strip()
-
-    # Contact information
-    if data.get("website"):
-        metadata["website"] = str(data["website"]).strip()
-    if data.get("phone"):
-        metadata["phone"] = str(data["phone"]).strip()
-    if data.get("ein"):
-        metadata["ein"] = str(data["ein"]).strip()
-
-    # Additional entity info
-    if data.get("lei"):
-        metadata["lei"] = str(data["lei"]).strip()
-    if data.get("investorWebsite"):
-        metadata["investor_website"] = str(data["investorWebsite"]).strip()
-    if data.get("description"):
-        metadata["entity_description"] = str(data["description"]).strip()
-    if data.get("ownerOrg"):
-        metadata["owner_organization"] = str(data["ownerOrg"]).strip()
-
-    # Regulatory flags
-    if data.get("flags"):
-        metadata["sec_flags"] = str(data["flags"]).strip()
+    # Plain string fields (SIC, incorporation, filer category, contact, flags)
+    for src, dst in _SUBMISSIONS_STR_FIELDS:
+        value = data.get(src)
+        if value:
+            metadata[dst] = str(value).strip()
+
+    # Insider transaction flags
     if "insiderTransactionForOwnerExists" in data:
         metadata["has_insider_transactions_as_owner"] = int(
             data["insiderTransactionForOwnerExists"]
@@ -912,40 +975,17 @@ def extract_metadata_from_submissions(data: dict) -> dict:
         if former_names:
             metadata["former_names"] = json.dumps(former_names)
 
-    # Business address
+    # Business and mailing addresses
     addresses = data.get("addresses", {})
     if isinstance(addresses, dict):
-        business = addresses.get("business", {})
-        if isinstance(business, dict):
-            if business.get("street1"):
-                metadata["business_street1"] = str(business["street1"]).strip()
-            if business.get("street2"):
-                metadata["business_street2"] = str(business["street2"]).strip()
-            if business.get("city"):
-                metadata["business_city"] = str(business["city"]).strip()
-            if business.get("stateOrCountry"):
-                metadata["business_state"] = str(business["stateOrCountry"]).strip()
-            if business.get("zipCode"):
-                metadata["business_zipcode"] = str(business["zipCode"]).strip()
-            # Some submissions have country field
-            if business.get("country"):
-                metadata["business_country"] = str(business["country"]).strip()
-
-        # Mailing address (may differ from business address)
-        mailing = addresses.get("mailing", {})
-        if isinstance(mailing, dict):
-            if mailing.get("street1"):
-                metadata["mailing_street1"] = str(mailing["street1"]).strip()
-            if mailing.get("street2"):
-                metadata["mailing_street2"] = str(mailing["street2"]).strip()
-            if mailing.get("city"):
-                metadata["mailing_city"] = str(mailing["city"]).strip()
-            if mailing.get("stateOrCountry"):
-                metadata["mailing_state"] = str(mailing["stateOrCountry"]).strip()
-            if mailing.get("zipCode"):
-                metadata["mailing_zipcode"] = str(mailing["zipCode"]).strip()
-            if mailing.get("country"):
-                metadata["mailing_country"] = str(mailing["country"]).strip()
+        for kind, fields in _ADDRESS_FIELDS:
+            address = addresses.get(kind, {})
+            if not isinstance(address, dict):
+                continue
+            for src, dst in fields:
+                value = address.get(src)
+                if value:
+                    metadata[dst] = str(value).strip()
 
     return metadata
 
@@ -1090,24 +1130,29 @@ def process_companyfacts_file(
     if not _is_nonempty_dict(facts):
         return 0, 0
 
-    rows: list[dict] = []
-    inserts_planned = 0
+    # Columnar pass: collect points first, then resolve each distinct date, unit and
+    # value name once (instead of one cache call per point), then build rows.
+    points = list(iter_companyfacts_points(facts))
 
-    for value_name, unit_name, end_date, raw_val in iter_companyfacts_points(facts):
-        date_id = get_date_id_cached(end_date)
-        if not date_id:
-            continue
-        unit_id = get_unit_id_cached(unit_name)
-        vn_id = get_value_name_id_cached(value_name, unit_id)
-        inserts_planned += 1
-        rows.append(
-            dict(
-                entity_id=entity_id,
-                date_id=date_id,
-                value_name_id=vn_id,
-                value=_safe_str(raw_val),
-            )
+    date_ids = {d: get_date_id_cached(d) for d in dict.fromkeys(p[2] for p in points)}
+    points = [p for p in points if date_ids[p[2]]]
+
+    unit_ids = {u: get_unit_id_cached(u) for u in dict.fromkeys(p[1] for p in points)}
+    vn_ids = {
+        key: get_value_name_id_cached(*key)
+        for key in dict.fromkeys((p[0], unit_ids[p[1]]) for p in points)
+    }
+
+    rows: list[dict] = [
+        dict(
+            entity_id=entity_id,
+            date_id=date_ids[end_date],
+            value_name_id=vn_ids[(value_name, unit_ids[unit_name])],
+            value=_safe_str(raw_val),
         )
+        for value_name, unit_name, end_date, raw_val in points
+    ]
+    inserts_planned = len(rows)
 
     inserted = _insert_daily_values_ignore_bulk(session, rows)
     duplicates = max(inserts_planned - inserted, 0)
@@ -1147,6 +1192,90 @@ def _build_sec_filing_urls(
     }
 
 
+def _load_existing_sec_filings(
+    session: SASession, entity_id: int, accessions: set[str]
+) -> dict[str, SecFiling]:
+    """Fetch an entity's existing filings for `accessions`, keyed by accession number.
+
+    Looks them up in batches of `SQLITE_IN_CLAUSE_BATCH_SIZE`.
+    """
+
+    keys = sorted(accessions)
+    found: dict[str, SecFiling] = {}
+    with session.no_autoflush:
+        for i in range(0, len(keys), SQLITE_IN_CLAUSE_BATCH_SIZE):
+            chunk = keys[i : i + SQLITE_IN_CLAUSE_BATCH_SIZE]
+            stmt = select(SecFiling).where(
+                SecFiling.entity_id == entity_id,
+                SecFiling.accession_number.in_(chunk),
+            )
+            for filing in session.scalars(stmt):
+                found[filing.accession_number] = filing
+    return found
+
+
+def _upsert_entity_identifiers_bulk(
+    session: SASession,
+    *,
+    entity_id: int,
+    scheme: str,
+    values: list[str],
+    issuer: str | None = None,
+) -> None:
+    """Batch form of `_get_or_create_entity_identifier` for one entity and scheme.
+
+    Existing rows are loaded with IN (...) lookups and get the same conflict check
+    and last-seen/issuer backfill; missing ones are written with one executemany
+    INSERT, which raises IntegrityError if another writer claimed a value meanwhile.
+    """
+    scheme_n = _scheme_alias(scheme)
+    # dict.fromkeys: de-duplicate while keeping payload order.
+    keys = list(dict.fromkeys(_normalize_identifier_value(scheme_n, v) for v in values))
+    if not keys:
+        return
+
+    existing: dict[str, EntityIdentifier] = {}
+    with session.no_autoflush:
+        for i in range(0, len(keys), SQLITE_IN_CLAUSE_BATCH_SIZE):
+            chunk = keys[i : i + SQLITE_IN_CLAUSE_BATCH_SIZE]
+            stmt = select(EntityIdentifier).where(
+                EntityIdentifier.scheme == scheme_n,
+                EntityIdentifier.value.in_(chunk),
+            )
+            for row in session.scalars(stmt):
+                existing[row.value] = row
+
+    now = utcnow()
+    new_rows: list[dict] = []
+    for value_n in keys:
+        row = existing.get(value_n)
+        if row is None:
+            new_rows.append(
+                dict(
+                    entity_id=entity_id,
+                    scheme=scheme_n,
+                    value=value_n,
+                    country=None,
+                    issuer=issuer,
+                    confidence="authoritative",
+                    added_at=now,
+                    last_seen_at=now,
+                )
+            )
+            continue
+        if row.entity_id != entity_id:
+            raise IntegrityError(
+                f"Identifier conflict: {scheme_n}:{value_n} already belongs to entity_id={row.entity_id}",
+                params=None,
+                orig=None,
+            )
+        if issuer and not row.issuer:
+            row.issuer = issuer
+        row.last_seen_at = now
+
+    _executemany_counted(session, _ENTITY_IDENTIFIERS_INSERT, new_rows)
+
+
 def _process_submission_filings(
     data: dict, entity: Entity, session: SASession
 ) -> tuple[int, int]:
@@ -1190,10 +1319,10 @@ def _process_submission_filings(
     # Best-effort CIK for URL building.
     cik_raw = data.get("cik")
 
-    inserted = 0
     updated = 0
 
     # Iterate using the accession array as the driver; other arrays may be missing/short.
+    parsed = []
     for i, acc_raw in enumerate(accession_arr):
         if not acc_raw:
             continue
@@ -1225,16 +1354,24 @@ def _process_submission_filings(
             str(cik_raw) if cik_raw is not None else "", str(acc_raw), primary_doc
         )
 
-        with session.no_autoflush:
-            existing = (
-                session.query(SecFiling)
-                .filter_by(entity_id=entity.id, accession_number=acc_norm)
-                .first()
-            )
+        parsed.append(
+            (acc_norm, form_type, filing_date, report_date, primary_doc, urls)
+        )
+
+    # One IN (...) lookup per batch instead of a SELECT per accession.
+    existing_by_acc = _load_existing_sec_filings(
+        session, entity.id, {rec[0] for rec in parsed}
+    )
+
+    new_rows: dict[str, dict] = {}
+    for acc_norm, form_type, filing_date, report_date, primary_doc, urls in parsed:
+        existing = existing_by_acc.get(acc_norm)
 
         if existing is None:
-            session.add(
-                SecFiling(
+            # First occurrence wins for accessions repeated within one payload.
+            new_rows.setdefault(
+                acc_norm,
+                dict(
                     entity_id=entity.id,
                     accession_number=acc_norm,
                     form_type=form_type,
@@ -1245,9 +1382,8 @@ def _process_submission_filings(
                     document_url=urls.get("document_url"),
                     full_text_url=urls.get("full_text_url"),
                     source="sec_submissions_local",
-                )
+                ),
             )
-            inserted += 1
             continue
 
         # Upsert/update path: only fill missing fields or update when the value differs.
@@ -1283,9 +1419,14 @@ def _process_submission_filings(
         if changed:
             updated += 1
 
-    if inserted or updated:
+    if updated:
         session.flush()
 
+    # New rows go out as one executemany within the caller's transaction.
+    inserted = _executemany_counted(
+        session, _SEC_FILINGS_INSERT_OR_IGNORE, list(new_rows.values())
+    )
+
     logger.info(
         "submissions filings upsert | entity_id=%s schema=%s inserted=%s updated=%s",
         entity.id,
@@ -1297,6 +1438,22 @@ def _process_submission_filings(
     return inserted, updated
 
 
+def _load_existing_sec_tickers(
+    session: SASession, tickers: set[str]
+) -> dict[tuple[str, str | None], SecTicker]:
+    """Fetch existing sec_tickers rows for `tickers`, keyed by (ticker, exchange)."""
+
+    keys = sorted(tickers)
+    found: dict[tuple[str, str | None], SecTicker] = {}
+    with session.no_autoflush:
+        for i in range(0, len(keys), SQLITE_IN_CLAUSE_BATCH_SIZE):
+            chunk = keys[i : i + SQLITE_IN_CLAUSE_BATCH_SIZE]
+            stmt = select(SecTicker).where(SecTicker.ticker.in_(chunk))
+            for row in session.scalars(stmt):
+                found[(row.ticker, row.exchange)] = row
+    return found
+
+
 def _process_submission_tickers(
     data: dict, entity: Entity, session: SASession
 ) -> tuple[int, int, int]:
@@ -1316,10 +1473,9 @@ def _process_submission_tickers(
     if not tickers:
         return 0, 0, 0
 
-    sec_inserted = 0
-    ident_count = 0
     skipped = 0
 
+    parsed: list[tuple[str, str | None]] = []
     for i, t in enumerate(tickers):
         if not t:
             skipped += 1
@@ -1332,27 +1488,27 @@ def _process_submission_tickers(
         exchange = None
         if i < len(exchanges) and exchanges[i]:
             exchange = str(exchanges[i]).strip().upper()
+        parsed.append((ticker, exchange))
+
+    existing_by_key = _load_existing_sec_tickers(session, {t for t, _ in parsed})
 
+    new_rows: dict[tuple[str, str | None], dict] = {}
+    for ticker, exchange in parsed:
         # Upsert into sec_tickers (unique on ticker,exchange). If unique belongs
         # to a different entity, let integrity error surface (data conflict).
-        with session.no_autoflush:
-            existing = (
-                session.query(SecTicker)
-                .filter_by(ticker=ticker, exchange=exchange)
-                .first()
-            )
+        existing = existing_by_key.get((ticker, exchange))
 
         if existing is None:
-            session.add(
-                SecTicker(
+            new_rows.setdefault(
+                (ticker, exchange),
+                dict(
                     entity_id=entity.id,
                     ticker=ticker,
                     exchange=exchange,
                     is_active=1,
                     source="sec_submissions_local",
-                )
+                ),
             )
-            sec_inserted += 1
         else:
             # Ensure it's marked active and associated entity matches.
             if existing.entity_id != entity.id:
@@ -1364,18 +1520,21 @@ def _process_submission_tickers(
             if getattr(existing, "is_active", 1) != 1:
                 existing.is_active = 1
 
-        # Also record identity mapping: ticker_exchange expects "TICKER:MIC".
-        if exchange:
-            _get_or_create_entity_identifier(
-                session,
-                entity_id=entity.id,
-                scheme="ticker_exchange",
-                value=f"{ticker}:{exchange}",
-                issuer="sec_submissions",
-            )
-            ident_count += 1
+    sec_inserted = _executemany_counted(
+        session, _SEC_TICKERS_INSERT, list(new_rows.values())
+    )
 
-    if sec_inserted or ident_count:
+    # Also record identity mapping: ticker_exchange expects "TICKER:MIC".
+    ident_values = [f"{ticker}:{exchange}" for ticker, exchange in parsed if exchange]
+    ident_count = len(ident_values)
+    if ident_values:
+        _upsert_entity_identifiers_bulk(
+            session,
+            entity_id=entity.id,
+            scheme="ticker_exchange",
+            values=ident_values,
+            issuer="sec_submissions",
+        )
         session.flush()
 
     logger.info(
@@ -1712,6 +1871,12 @@ def _run(
                 date_cache[date_str] = date_entry.id
                 return date_entry.id
 
+            _preload_dimension_caches(
+                session,
+                unit_cache=unit_cache,
+                value_name_cache=value_name_cache,
+                date_cache=date_cache,
+            )
             get_unit_id_cached("NA")
 
             for idx, (source, file_path, filename) in enumerate(files, 1):
@@ -1742,8 +1907,7 @@ def _run(
                     )
 
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = load_json_file(file_path)
 
                     if not isinstance(data, dict):
                         _log_unprocessed(
@@ -4,7 +4,7 @@ import os
 # Allow running as standalone script
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-import json
+import re
 from datetime import date as _date
 
 from sqlalchemy import create_engine
@@ -18,6 +18,7 @@ from models.entity_metadata import EntityMetadata
 from models.units import Unit
 from models.value_names import ValueName
 from models.entity_identifiers import EntityIdentifier
+from utils.file_ops import load_json_file
 import uuid
 
 # Ensure all tables are registered on Base.metadata
@@ -42,9 +43,18 @@ def _init_db_globals(db_path: str = DB_PATH):
     Session = sessionmaker(bind=engine)
 
 
+# Common shapes ('1750', '0000001750', 'CIK0000001750') without the int()/except
+# round-trip; anything else falls through to the lenient path below.
+_CIK_RE = re.compile(r"\s*(?:CIK)?0*(\d+)\s*", re.ASCII)
+
+
 def _normalize_cik(raw) -> str | None:
     if raw is None:
         return None
+    if isinstance(raw, str):
+        m = _CIK_RE.fullmatch(raw)
+        if m:
+            return m.group(1).zfill(10)
     try:
         return str(int(raw)).zfill(10)
     except Exception:
@@ -163,9 +173,11 @@ def _get_or_create_value_name(session, name: str, unit_id: int | None = None) ->
 
 
 def _iter_json_files(dir_path: str):
-    if not os.path.isdir(dir_path):
+    try:
+        names = os.listdir(dir_path)
+    except (FileNotFoundError, NotADirectoryError):
         return
-    for fn in sorted(os.listdir(dir_path)):
+    for fn in sorted(names):
         if fn.lower().endswith(".json"):
             yield os.path.join(dir_path, fn), fn
 
@@ -177,8 +189,7 @@ def _process_submissions(session) -> dict[str, int]:
 
     for path, fn in _iter_json_files(SUBMISSIONS_DIR):
         counts["files"] += 1
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json_file(path)
 
         if not isinstance(data, dict):
             continue
@@ -232,8 +243,7 @@ def _process_companyfacts(session) -> dict[str, int]:
 
     for path, fn in _iter_json_files(COMPANYFACTS_DIR):
         counts["files"] += 1
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = load_json_file(path)
 
         if not isinstance(data, dict):
             continue